@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+from masks import CollisionMask
+
+CACHE_DIR_NAME = ".asset_cache"
+
+
+def build_image(src, size=None, flip=False):
+    img = Image.open(src)
+    if size:
+        img = img.resize(size, Image.LANCZOS)
+    if flip:
+        img = img.transpose(Image.FLIP_LEFT_RIGHT)
+    img.load()
+    return img
+
+
+class AssetCache:
+    # 리사이즈/뒤집기까지 끝낸 이미지를 원본 해시 + 크기로 키를 잡아 디스크에 저장해 둔다
+    # 캐시 파일은 "모드 가로 세로" 한 줄 + 픽셀 원본 바이트라서 PNG 디코딩 없이 바로 읽힌다
+    # 충돌 마스크도 같은 키에 .mask 를 붙여 옆에 둔다
+    def __init__(self, base_path, cache_dir=None):
+        self.base_path = base_path
+        self.cache_dir = cache_dir or os.path.join(base_path, CACHE_DIR_NAME)
+        self.hits = 0
+        self.misses = 0
+        self._digests = {}
+
+    def digest(self, src):
+        if src not in self._digests:
+            with open(src, "rb") as f:
+                self._digests[src] = hashlib.sha1(f.read()).hexdigest()[:16]
+        return self._digests[src]
+
+    def cache_path(self, name, size=None, flip=False, ext="raw"):
+        src = os.path.join(self.base_path, name)
+        stem = os.path.splitext(name)[0]
+        size_key = f"{size[0]}x{size[1]}" if size else "orig"
+        flip_key = "-flip" if flip else ""
+        return os.path.join(self.cache_dir, f"{stem}-{self.digest(src)}-{size_key}{flip_key}.{ext}")
+
+    def load(self, name, size=None, flip=False):
+        src = os.path.join(self.base_path, name)
+        if not os.path.exists(src):
+            return None
+
+        path = self.cache_path(name, size, flip)
+        img = self._read(path)
+        if img is not None:
+            self.hits += 1
+            return img
+
+        self.misses += 1
+        img = build_image(src, size, flip)
+        self._write(path, img)
+        return img
+
+    def load_mask(self, name, size=None, flip=False, dilate=0):
+        # dilate: 반지름이 있는 물체(폭탄)용으로 마스크를 그만큼 부풀린다
+        src = os.path.join(self.base_path, name)
+        if not os.path.exists(src):
+            return None
+
+        path = self.cache_path(name, size, flip, f"d{dilate}.mask" if dilate else "mask")
+        try:
+            with open(path, "rb") as f:
+                mask = CollisionMask.from_bytes(f.read())
+            self.hits += 1
+            return mask
+        except (OSError, ValueError):
+            pass
+
+        self.misses += 1
+        mask = CollisionMask.from_image(self.load(name, size, flip))
+        if dilate:
+            mask = mask.dilate(dilate)
+        self._save(path, mask.to_bytes())
+        return mask
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as f:
+                mode, w, h = f.readline().split()
+                data = f.read()
+            return Image.frombytes(mode.decode(), (int(w), int(h)), data)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, img):
+        self._save(path, f"{img.mode} {img.width} {img.height}\n".encode(), img.tobytes())
+
+    def _save(self, path, *parts):
+        # 캐시를 못 쓰는 환경이면 그냥 매번 원본에서 만든다
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                for part in parts:
+                    f.write(part)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+# Game.__init__ 이 불러오는 이미지 목록 (파일, 크기, 좌우 반전)
+GAME_SPRITES = [
+    ("menu_bg.png", None, False),
+    ("ingame_bg.png", (800, 480), False),
+    ("spaghetti.png", (120, 120), False),
+    ("spaghetti.png", (60, 60), False),
+    ("player.png", (40, 40), False),
+    ("player.png", (40, 40), True),
+]
+
+
+def startup_report(base_path, repeat=5):
+    # 기존 방식(매번 디코딩 + LANCZOS) / 첫 실행(캐시 생성) / 다음 실행(캐시 사용) 을 비교한다
+    def best_of(fn):
+        times = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t)
+        return min(times) * 1000
+
+    def direct():
+        for name, size, flip in GAME_SPRITES:
+            build_image(os.path.join(base_path, name), size, flip)
+
+    cache_dir = tempfile.mkdtemp(prefix="asset_cache_")
+
+    def cold():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        cache = AssetCache(base_path, cache_dir)
+        for name, size, flip in GAME_SPRITES:
+            cache.load(name, size, flip)
+
+    def warm():
+        cache = AssetCache(base_path, cache_dir)
+        for name, size, flip in GAME_SPRITES:
+            cache.load(name, size, flip)
+
+    try:
+        direct_ms = best_of(direct)
+        cold_ms = best_of(cold)
+        warm_ms = best_of(warm)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"기존 방식 (디코딩 + 리사이즈): {direct_ms:7.1f} ms")
+    print(f"첫 실행 (캐시 생성):          {cold_ms:7.1f} ms")
+    print(f"다음 실행 (캐시 사용):        {warm_ms:7.1f} ms  ({direct_ms / max(warm_ms, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    startup_report(sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+
+# 효과음별 (동시에 울릴 수 있는 수, 같은 소리를 합치는 간격 초, 꽉 차면 가장 오래된 소리를 끊을지)
+VOICE_LIMITS = {
+    "gun": (4, 0.05, True),
+    "bomb": (3, 0.1, False),
+    "reload": (1, 0.3, False),
+}
+
+
+class VoiceGroup:
+    __slots__ = ("channels", "started", "window", "steal", "last")
+
+    def __init__(self, channels, window, steal):
+        self.channels = channels
+        self.started = [0.0] * len(channels)
+        self.window = window
+        self.steal = steal
+        self.last = float("-inf")
+
+
+class VoiceManager:
+    # 효과음마다 채널을 따로 예약해 두고(set_reserved) 그 안에서만 재생한다
+    # 그래서 총소리가 아무리 많아도 폭탄/재장전 소리 채널을 뺏지 못한다
+    # 같은 소리가 window 안에 또 오면 합치고(coalesced), 채널이 다 차 있으면 버리거나(dropped) 가장 오래된 것을 끊는다(stolen)
+    def __init__(self, mixer, limits, clock=time.perf_counter):
+        self.clock = clock
+        self.groups = {}
+        self.played = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.stolen = 0
+
+        reserved = sum(voices for voices, window, steal in limits.values())
+        # 예약하지 않은 채널도 몇 개 남겨 둔다 (관리하지 않는 소리용)
+        if mixer.get_num_channels() < reserved + 2:
+            mixer.set_num_channels(reserved + 2)
+        mixer.set_reserved(reserved)
+        first = 0
+        for key, (voices, window, steal) in limits.items():
+            channels = [mixer.Channel(first + i) for i in range(voices)]
+            self.groups[key] = VoiceGroup(channels, window, steal)
+            first += voices
+
+    def play(self, key, sound):
+        group = self.groups.get(key)
+        if group is None:
+            sound.play()
+            self.played += 1
+            return
+
+        now = self.clock()
+        if now - group.last < group.window:
+            self.coalesced += 1
+            return
+
+        channels = group.channels
+        for i, ch in enumerate(channels):
+            if not ch.get_busy():
+                break
+        else:
+            if not group.steal:
+                self.dropped += 1
+                return
+            i = min(range(len(channels)), key=group.started.__getitem__)
+            self.stolen += 1
+
+        channels[i].play(sound)
+        group.started[i] = now
+        group.last = now
+        self.played += 1
+
+    def stats(self):
+        return {"played": self.played, "dropped": self.dropped,
+                "coalesced": self.coalesced, "stolen": self.stolen}
+
+
+class SoundBank:
+    # pygame 은 import 만으로도 수백 ms 가 걸려서
+    # import, 믹서 초기화, 효과음 디코딩을 전부 백그라운드 스레드에서 한다 (pygame.init 은 쓰지 않는다)
+    # 준비되기 전에 요청된 효과음은 건너뛰고, 배경음은 준비되는 대로 재생한다
+    def __init__(self, base_path, effects, music=None, limits=None):
+        self.base_path = base_path
+        self.effects = effects
+        self.music = music
+        self.limits = limits
+        self.voices = None
+
+        self.pygame = None
+        self.sounds = {}
+        self.music_ready = False
+        self.music_wanted = False
+        self.closed = False
+        self.load_time = None
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._load, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    @property
+    def ready(self):
+        return self.load_time is not None
+
+    def _load(self):
+        # 어디서 끝나든 load_time 은 남긴다 (ready 가 영영 False 로 남지 않게)
+        t = time.perf_counter()
+        try:
+            self._load_files()
+        finally:
+            self.load_time = time.perf_counter() - t
+
+    def _load_files(self):
+        try:
+            import pygame
+            pygame.mixer.init()
+        except ImportError:
+            return
+        except (RuntimeError, pygame.error):
+            # 오디오 장치가 없는 환경
+            return
+        self.pygame = pygame
+        if self.limits:
+            self.voices = VoiceManager(pygame.mixer, self.limits)
+
+        for key, name in self.effects.items():
+            path = os.path.join(self.base_path, name)
+            if self.closed:
+                return
+            if os.path.exists(path):
+                try:
+                    self.sounds[key] = pygame.mixer.Sound(path)
+                except pygame.error:
+                    # 깨졌거나 읽을 수 없는 파일은 건너뛴다 (그 효과음만 안 난다)
+                    continue
+
+        if self.music:
+            path = os.path.join(self.base_path, self.music)
+            if os.path.exists(path):
+                try:
+                    pygame.mixer.music.load(path)
+                except pygame.error:
+                    return
+                with self.lock:
+                    self.music_ready = True
+                    if self.music_wanted and not self.closed:
+                        pygame.mixer.music.play(-1)
+
+    def play(self, key):
+        snd = self.sounds.get(key)
+        if snd is None:
+            return
+        if self.voices:
+            self.voices.play(key, snd)
+        else:
+            snd.play()
+
+    def voice_stats(self):
+        return self.voices.stats() if self.voices else None
+
+    def play_music(self):
+        with self.lock:
+            self.music_wanted = True
+            if self.music_ready:
+                self.pygame.mixer.music.play(-1)
+
+    def stop_music(self):
+        with self.lock:
+            self.music_wanted = False
+            if self.music_ready:
+                self.pygame.mixer.music.stop()
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            if self.pygame:
+                self.pygame.quit()
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# 창 없이 정해진 플레이 방식으로 여러 판을 돌려 밸런스 값 조합을 비교한다
+#   python batch.py --games 200 --set monster_speed=5,6,7 --set bomb_damage=20,40
+# 조합마다 같은 시드 목록을 써서 값 차이만 결과에 드러나게 한다
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from settings import *
+from assets import AssetCache
+from masks import load_sprite_masks
+from simulation import Simulation, InputState
+
+_masks = None
+
+
+def scripted_policy(sim, rng):
+    # 괴물과 300 정도 거리를 두고 계속 쏘다가, 너무 가까워지면 폭탄을 던지고 오른쪽으로 물러난다
+    dx = sim.m_x - sim.p_x
+    dy = sim.m_y - (sim.p_y - 20)
+    dist = math.hypot(dx, dy)
+
+    # 바로 앞에 장애물이 있으면 뛰어넘는다
+    blocked = next(sim.obstacles.query(sim.p_x + 10, sim.p_x + 70), None) is not None
+
+    return InputState(
+        left=dist > 350,
+        right=dist < 300,
+        jump=blocked or rng.random() < 0.01,
+        reload=sim.ammo == 0,
+        fire=True,
+        bomb=sim.bomb_count > 0 and not sim.m_stunned and dist < 250,
+        mouse_x=sim.m_x - sim.scroll_x,
+        mouse_y=sim.m_y,
+    )
+
+
+def sprite_masks():
+    # 프로세스마다 한 번만 읽는다 (.asset_cache 에 있으면 이미지를 디코딩하지 않는다)
+    global _masks
+    if _masks is None:
+        _masks = load_sprite_masks(AssetCache(os.path.dirname(os.path.abspath(__file__))))
+    return _masks
+
+
+def run_game(task):
+    # 프로세스 풀에서 돌기 때문에 인자/결과는 피클 가능한 기본형만 쓴다
+    balance_values, seed, max_ticks, use_masks = task
+    sim = Simulation(seed, BalanceConfig(**balance_values), masks=sprite_masks() if use_masks else None)
+    rng = random.Random(seed ^ 0x5EED)
+    ticks = 0
+    while sim.state == "PLAY" and ticks < max_ticks:
+        sim.step(scripted_policy(sim, rng), TICK)
+        ticks += 1
+    return sim.state, sim.time, sim.m_hp
+
+
+def parse_grid(pairs):
+    # ["monster_speed=5,6", "stun_time=2.5"] -> [{"monster_speed": 5, "stun_time": 2.5}, ...]
+    keys = []
+    values = []
+    defaults = BalanceConfig()
+    for pair in pairs:
+        key, _, raw = pair.partition("=")
+        key = key.strip()
+        if key not in BalanceConfig.__slots__:
+            raise ValueError(f"알 수 없는 값: {key} ({', '.join(BalanceConfig.__slots__)})")
+        kind = type(getattr(defaults, key))
+        keys.append(key)
+        values.append([kind(v) for v in raw.split(",") if v.strip()])
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def summarize(config, results):
+    games = len(results)
+    clear_times = sorted(t for state, t, hp in results if state == "CLEAR")
+    game_overs = sum(1 for state, t, hp in results if state == "GAME_OVER")
+
+    def pick(p):
+        return clear_times[min(len(clear_times) - 1, int(p / 100 * len(clear_times)))]
+
+    summary = {
+        "config": config,
+        "games": games,
+        "clear_rate": len(clear_times) / games,
+        "game_over_rate": game_overs / games,
+        "timeout_rate": (games - len(clear_times) - game_overs) / games,
+        "mean_hp_left": sum(max(0, hp) for state, t, hp in results) / games,
+    }
+    if clear_times:
+        summary["clear_time"] = {
+            "min": clear_times[0],
+            "p10": pick(10),
+            "p50": pick(50),
+            "p90": pick(90),
+            "max": clear_times[-1],
+            "mean": sum(clear_times) / len(clear_times),
+        }
+    return summary
+
+
+def print_summary(s):
+    label = ", ".join(f"{k}={v}" for k, v in s["config"].items()) or "기본값"
+    line = (f"{label:<40} 클리어 {s['clear_rate'] * 100:5.1f}%  게임오버 {s['game_over_rate'] * 100:5.1f}%  "
+            f"시간초과 {s['timeout_rate'] * 100:5.1f}%")
+    if "clear_time" in s:
+        t = s["clear_time"]
+        line += f"  클리어 시간 p10={t['p10']:.1f}s p50={t['p50']:.1f}s p90={t['p90']:.1f}s"
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="밸런스 값 조합별 자동 플레이 통계")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=V1,V2,...",
+                        help=f"바꿔 볼 값 ({', '.join(BalanceConfig.__slots__)}), 여러 번 쓰면 모든 조합")
+    parser.add_argument("--games", type=int, default=100, help="조합마다 돌릴 판 수")
+    parser.add_argument("--seed", type=int, default=1, help="첫 판의 시드 (판마다 1씩 증가)")
+    parser.add_argument("--max-seconds", type=float, default=600, help="한 판의 최대 게임 시간 (넘으면 시간초과)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="프로세스 수")
+    parser.add_argument("--out", metavar="JSON", help="결과를 JSON 으로 저장")
+    parser.add_argument("--circles", action="store_true",
+                        help="원/거리 판정으로 돌린다 (기본은 게임과 같은 스프라이트 마스크 판정)")
+    args = parser.parse_args(argv)
+
+    if args.games < 1:
+        parser.error("--games 는 1 이상이어야 합니다")
+    if args.workers < 1:
+        parser.error("--workers 는 1 이상이어야 합니다")
+    try:
+        grid = parse_grid(args.set)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # 게임처럼 이미지가 없으면 원 판정으로 돌아간다
+    use_masks = not args.circles and sprite_masks() is not None
+
+    max_ticks = int(args.max_seconds * FPS)
+    seeds = [args.seed + i for i in range(args.games)]
+    tasks = [(config, seed, max_ticks, use_masks) for config in grid for seed in seeds]
+
+    print(f"조합 {len(grid)}개 x {args.games}판 = {len(tasks)}판, 프로세스 {args.workers}개, "
+          f"{'마스크' if use_masks else '원'} 판정")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        chunk = max(1, len(tasks) // (args.workers * 8))
+        results = list(pool.map(run_game, tasks, chunksize=chunk))
+    elapsed = time.perf_counter() - start
+
+    summaries = []
+    for i, config in enumerate(grid):
+        s = summarize(config, results[i * args.games:(i + 1) * args.games])
+        summaries.append(s)
+        print_summary(s)
+    print(f"{elapsed:.1f}초 ({len(tasks) / elapsed:.1f}판/초)")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({
+                "games": args.games,
+                "seed": args.seed,
+                "max_seconds": args.max_seconds,
+                "masks": use_masks,
+                "results": summaries,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"-> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
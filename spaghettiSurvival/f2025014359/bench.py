@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+# 시뮬레이션 틱 / 렌더 프레임 부하 측정
+#   python bench.py                       모든 시나리오, 결과를 bench_results.json 에 저장
+#   python bench.py bullets --ticks 600   한 시나리오만
+#   python bench.py --compare old.json    이전 결과와 비교
+# 디스플레이가 없으면 렌더링은 OffscreenCanvas 로 잰다 (Xvfb 에서는 --canvas tk, pygame 백엔드는 --canvas pygame)
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+from settings import *
+from simulation import Simulation, InputState
+from wave import WaveSimulation
+from renderer import CanvasRenderer
+
+
+class OffscreenCanvas:
+    # CanvasRenderer 가 쓰는 tk.Canvas 메서드만 흉내 낸 화면 없는 캔버스
+    # 아이템 생성/수정 호출 비용과 횟수를 재는 용도이고 실제로 그리지는 않는다
+    def __init__(self):
+        self.items = {}
+        self.order = []
+        self.next_id = 1
+        self.calls = 0
+
+    def _create(self, kind, coords, options):
+        item = self.next_id
+        self.next_id += 1
+        tags = options.get("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        self.items[item] = [kind, list(coords), dict(options), set(tags)]
+        self.order.append(item)
+        self.calls += 1
+        return item
+
+    def create_image(self, *coords, **options):
+        return self._create("image", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def _find(self, tag_or_id):
+        if tag_or_id in self.items:
+            return [tag_or_id]
+        return [i for i in self.order if tag_or_id in self.items[i][3]]
+
+    def coords(self, item, *coords):
+        self.calls += 1
+        self.items[item][1] = list(coords)
+
+    def itemconfigure(self, tag_or_id, **options):
+        self.calls += 1
+        for item in self._find(tag_or_id):
+            self.items[item][2].update(options)
+
+    itemconfig = itemconfigure
+
+    def tag_lower(self, item, below):
+        self.calls += 1
+        self.order.remove(item)
+        self.order.insert(self.order.index(below), item)
+
+    def tag_raise(self, tag_or_id, above=None):
+        self.calls += 1
+        found = self._find(tag_or_id)
+        for item in found:
+            self.order.remove(item)
+        self.order.extend(found)
+
+    def delete(self, tag_or_id):
+        self.calls += 1
+        for item in self._find(tag_or_id):
+            self.order.remove(item)
+            del self.items[item]
+
+    def update(self):
+        pass
+
+
+# 시나리오: 시뮬레이션을 만들고, 매 틱 부하를 채워 넣는 함수를 돌려준다
+# 괴물은 멀리서 계속 기절해 있게 해서 판이 끝나지 않게 한다
+
+def _endless(sim):
+    sim.m_hp = 10**9
+    sim.m_x = sim.p_x - 5000
+    sim.m_stunned = True
+    sim.m_stun_end_time = float("inf")
+
+
+def _fill_bullets(sim, count):
+    pool = sim.bullets
+    i = pool.n
+    while pool.n < count:
+        angle = (i * 0.618) % (2 * math.pi)
+        r = (i * 37) % 300
+        pool.spawn(sim.scroll_x + 400 + math.cos(angle) * r, 240 + math.sin(angle) * r * 0.6, angle)
+        i += 1
+
+
+def _fill_bombs(sim, count):
+    pool = sim.bombs
+    i = pool.n
+    while pool.n < count:
+        # 괴물보다 훨씬 먼 목표로 던져서 오래 날아가게 한다
+        pool.spawn(sim.p_x, sim.p_y - 20, sim.p_x + 3000 + i, 100 + i % 200)
+        i += 1
+
+
+def _fill_obstacles(sim, count):
+    # 화면 왼쪽 끝부터 4px 간격으로 채운다 (레벨 스트림이 넣은 앞쪽 청크 뒤에 붙이면 전부 화면 밖이 된다)
+    track = sim.obstacles
+    x = sim.scroll_x - 40
+    while len(track) < count:
+        track.add(x, 10 + len(track) % 9 * 10, 30)
+        x += 4
+
+
+def scenario_idle(scale):
+    sim = Simulation(seed=1)
+    _endless(sim)
+    return sim, lambda s, i: None, InputState(mouse_x=700, mouse_y=200)
+
+
+def scenario_bullets(scale):
+    sim = Simulation(seed=1)
+    _endless(sim)
+    count = min(BULLET_CAPACITY, int(3000 * scale))
+    return sim, lambda s, i: _fill_bullets(s, count), InputState(fire=True, mouse_x=700, mouse_y=200)
+
+
+def scenario_obstacles(scale):
+    sim = Simulation(seed=1)
+    _endless(sim)
+    sim.obstacles.clear()
+    count = int(400 * scale)
+    return sim, lambda s, i: _fill_obstacles(s, count), InputState(mouse_x=700, mouse_y=200)
+
+
+def scenario_bombs(scale):
+    sim = Simulation(seed=1)
+    _endless(sim)
+    count = min(BOMB_CAPACITY, int(60 * scale))
+    return sim, lambda s, i: _fill_bombs(s, count), InputState(mouse_x=700, mouse_y=200)
+
+
+def scenario_long_scroll(scale):
+    sim = Simulation(seed=1)
+    sim.scroll_x = 10**7
+    sim.p_x += sim.scroll_x
+    sim.save_prev()
+    _endless(sim)
+
+    def refill(s, i):
+        s.m_x = s.p_x - 5000
+    return sim, refill, InputState(right=True, jump=True, mouse_x=700, mouse_y=200)
+
+
+def scenario_mixed(scale):
+    sim = Simulation(seed=1)
+    _endless(sim)
+    sim.obstacles.clear()
+    bullets = min(BULLET_CAPACITY, int(2000 * scale))
+    bombs = min(BOMB_CAPACITY, int(30 * scale))
+    obstacles = int(200 * scale)
+
+    def refill(s, i):
+        s.m_x = s.p_x - 5000
+        _fill_bullets(s, bullets)
+        _fill_bombs(s, bombs)
+        _fill_obstacles(s, obstacles)
+    return sim, refill, InputState(right=True, fire=True, mouse_x=700, mouse_y=200)
+
+
+def scenario_wave(scale):
+    # 움직이지 않고 죽지 않는 작은 괴물들을 화면에 깔고 총알을 채운다
+    sim = WaveSimulation(seed=1)
+    sim.next_wave_time = None
+    count = min(WAVE_MONSTER_CAPACITY, int(300 * scale))
+    bullets = min(BULLET_CAPACITY, int(2000 * scale))
+    for i in range(count):
+        # 플레이어(x=400) 근처는 비워 둔다
+        x = (i * 97) % (SCREEN_WIDTH - 2 * WAVE_CATCH_DIST - 40)
+        if x > 400 - WAVE_CATCH_DIST - 20:
+            x += 2 * WAVE_CATCH_DIST + 40
+        sim.monsters.spawn(sim.scroll_x + x, 250 + (i * 31) % 70, 0, 10**9)
+
+    def refill(s, i):
+        _fill_bullets(s, bullets)
+    return sim, refill, InputState(fire=True, mouse_x=700, mouse_y=200)
+
+
+SCENARIOS = {
+    "idle": scenario_idle,
+    "bullets": scenario_bullets,
+    "obstacles": scenario_obstacles,
+    "bombs": scenario_bombs,
+    "long_scroll": scenario_long_scroll,
+    "mixed": scenario_mixed,
+    "wave": scenario_wave,
+}
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+    return {
+        "p50": pick(50),
+        "p90": pick(90),
+        "p99": pick(99),
+        "max": ordered[-1] * 1000,
+        "mean": sum(ordered) / len(ordered) * 1000,
+    }
+
+
+def make_renderer(kind):
+    # (이름, 렌더러, 화면 반영 함수, 정리 함수)
+    if kind == "auto":
+        kind = "tk" if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin") else "offscreen"
+    if kind == "tk":
+        import tkinter
+        root = tkinter.Tk()
+        canvas = tkinter.Canvas(root, width=SCREEN_WIDTH, height=SCREEN_HEIGHT)
+        canvas.pack()
+        return "tk", CanvasRenderer(canvas), lambda dirty: root.update(), root.destroy
+    if kind == "pygame":
+        # 화면이 없으면 SDL_VIDEODRIVER=dummy 로 돌린다 (그리기 비용만 잰다)
+        import pygame
+        from pygame_backend import PygameRenderer
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        return "pygame", PygameRenderer(screen), pygame.display.update, pygame.quit
+    return "offscreen", CanvasRenderer(OffscreenCanvas()), None, None
+
+
+def run_scenario(name, ticks, scale, canvas_kind, render=True):
+    sim, refill, inp = SCENARIOS[name](scale)
+
+    for i in range(30):
+        refill(sim, i)
+        sim.step(inp, TICK)
+
+    tick_times = []
+    for i in range(ticks):
+        refill(sim, i)
+        t = time.perf_counter()
+        sim.step(inp, TICK)
+        tick_times.append(time.perf_counter() - t)
+
+    result = {
+        "ticks": ticks,
+        "bullets": sim.bullets.n,
+        "bombs": sim.bombs.n,
+        "obstacles": len(sim.obstacles),
+        "tick_ms": percentiles(tick_times),
+    }
+
+    if render:
+        kind, renderer, present, close = make_renderer(canvas_kind)
+        frame_times = []
+        try:
+            for i in range(ticks):
+                refill(sim, i)
+                sim.step(inp, TICK)
+                t = time.perf_counter()
+                dirty = renderer.draw(sim, 0.5)
+                if present:
+                    present(dirty)
+                frame_times.append(time.perf_counter() - t)
+        finally:
+            if close:
+                close()
+        result["canvas"] = kind
+        result["frame_ms"] = percentiles(frame_times)
+
+    return result
+
+
+def print_result(name, res):
+    tick = res["tick_ms"]
+    line = (f"{name:<12} bullets={res['bullets']:<5} bombs={res['bombs']:<3} obstacles={res['obstacles']:<4} "
+            f"tick p50={tick['p50']:.3f} p99={tick['p99']:.3f} ms")
+    if "frame_ms" in res:
+        frame = res["frame_ms"]
+        line += f" | frame({res['canvas']}) p50={frame['p50']:.3f} p99={frame['p99']:.3f} ms"
+    print(line)
+
+
+def compare(old, new):
+    print(f"{'':<12}{'tick p50':>20}{'frame p50':>22}")
+    for name, res in new["scenarios"].items():
+        before = old["scenarios"].get(name)
+        if not before:
+            continue
+        cells = []
+        for key in ("tick_ms", "frame_ms"):
+            if key in res and key in before:
+                a = before[key]["p50"]
+                b = res[key]["p50"]
+                cells.append(f"{a:.3f}->{b:.3f} ({a / max(b, 1e-9):.2f}x)")
+            else:
+                cells.append("-")
+        print(f"{name:<12}{cells[0]:>20}{cells[1]:>22}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="업데이트/렌더 부하 측정")
+    parser.add_argument("scenarios", nargs="*", help=f"{', '.join(SCENARIOS)} 중 선택 (생략하면 전부)")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--scale", type=float, default=1.0, help="시나리오 개체 수 배율")
+    parser.add_argument("--canvas", choices=["auto", "tk", "offscreen", "pygame"], default="auto")
+    parser.add_argument("--no-render", action="store_true", help="시뮬레이션만 측정")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="이전 결과 파일과 비교")
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or list(SCENARIOS)
+    for name in names:
+        if name not in SCENARIOS:
+            parser.error(f"알 수 없는 시나리오: {name}")
+    results = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "ticks": args.ticks,
+        "scale": args.scale,
+        "scenarios": {},
+    }
+    for name in names:
+        res = run_scenario(name, args.ticks, args.scale, args.canvas, render=not args.no_render)
+        results["scenarios"][name] = res
+        print_result(name, res)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"-> {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
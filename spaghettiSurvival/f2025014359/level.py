@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# 시드로 정해지는 장애물 배치
+# 레벨은 CHUNK_WIDTH 폭의 청크로 나뉘고 청크 i 의 장애물은 (레벨 시드, i) 만으로 정해진다
+# 그래서 FPS 나 플레이어 속도와 관계없이 같은 시드면 같은 지형이 나오고, 필요해지기 전에 미리 만들 수 있다
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from settings import *
+
+_worker = None
+
+
+def background_worker():
+    # 모든 LevelStream 이 같이 쓰는 청크 생성 스레드 하나
+    global _worker
+    if _worker is None:
+        _worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level")
+    return _worker
+
+
+def chunk_left(index):
+    return LEVEL_START_X + index * CHUNK_WIDTH
+
+
+def first_needed_chunk(scroll_x):
+    # 카메라 뒤로 완전히 지나간 청크는 만들 필요가 없다
+    return max(0, int((scroll_x - LEVEL_BEHIND - LEVEL_START_X) // CHUNK_WIDTH))
+
+
+def generate_chunk(level_seed, index):
+    # 청크 안의 장애물 [(x, h, w), ...] 를 x 순서로 돌려준다. 장애물은 청크 경계를 넘지 않는다
+    rng = random.Random(f"{level_seed}:{index}")
+    left = chunk_left(index)
+    right = left + CHUNK_WIDTH
+    out = []
+    x = left + rng.randint(0, OBSTACLE_GAP_MAX)
+    while x + OBSTACLE_WIDTH <= right:
+        out.append((x, rng.randint(1, 9) * 10, OBSTACLE_WIDTH))
+        x += OBSTACLE_WIDTH + rng.randint(OBSTACLE_GAP_MIN, OBSTACLE_GAP_MAX)
+    return out
+
+
+class LevelStream:
+    # 카메라 앞쪽으로 들어오는 청크를 ObstacleTrack 에 넣는다 (지나간 장애물은 track.expire 가 버린다)
+    # executor 를 주면 다음 LEVEL_PREFETCH 개 청크를 그 스레드에서 미리 만들어 둔다
+    # 미리 만든 것과 그 자리에서 만든 것은 내용이 같으므로 스레드가 늦어도 결과는 바뀌지 않는다
+    def __init__(self, track, executor=None):
+        self.track = track
+        self.executor = executor
+        self.pending = {}      # 청크 번호 -> Future
+        self.reset(0)
+
+    def reset(self, level_seed):
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.level_seed = level_seed
+        self.next_index = 0
+
+    def restore(self, level_seed, next_index):
+        # 되감기: 같은 시드면 미리 만들어 둔 청크를 그대로 쓸 수 있다
+        if level_seed != self.level_seed:
+            self.reset(level_seed)
+        self.next_index = next_index
+
+    def _chunk(self, index):
+        future = self.pending.pop(index, None)
+        if future is not None:
+            return future.result()
+        return generate_chunk(self.level_seed, index)
+
+    def advance(self, scroll_x):
+        skip = first_needed_chunk(scroll_x)
+        if skip > self.next_index:
+            for index in range(self.next_index, skip):
+                future = self.pending.pop(index, None)
+                if future is not None:
+                    future.cancel()
+            self.next_index = skip
+
+        edge = scroll_x + SCREEN_WIDTH + LEVEL_LOOKAHEAD
+        while chunk_left(self.next_index) < edge:
+            for x, h, w in self._chunk(self.next_index):
+                self.track.add(x, h, w)
+            self.next_index += 1
+
+        if self.executor is not None and len(self.pending) < LEVEL_PREFETCH:
+            for index in range(self.next_index, self.next_index + LEVEL_PREFETCH):
+                if index not in self.pending:
+                    self.pending[index] = self.executor.submit(generate_chunk, self.level_seed, index)
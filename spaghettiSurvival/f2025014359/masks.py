@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# 스프라이트 알파 채널로 만든 픽셀 단위 충돌 마스크
+# 마스크 좌표는 스프라이트를 그리는 기준점(이미지 가운데)에서 잰다
+# 괴물은 (m_x, m_y), 플레이어는 (p_x, p_y - 20) 이 기준점이다
+import numpy as np
+
+from settings import *
+
+
+class CollisionMask:
+    # bits: 행마다 np.packbits 로 8픽셀씩 묶은 uint8 배열 (왼쪽 픽셀이 높은 비트)
+    # x0, y0: bits 의 (0, 0) 픽셀 왼쪽 위 모서리 위치
+    # 불투명 픽셀을 감싸는 사각형(left, top, right, bottom)으로 먼저 거르고 남은 점만 비트를 본다
+    def __init__(self, bits, width, x0, y0):
+        self.bits = bits
+        self.width = width
+        self.height = bits.shape[0]
+        self.x0 = x0
+        self.y0 = y0
+        # 겹침 검사용으로 행을 정수 하나로 묶어 둔다 (시프트 + AND 로 행 단위 비교)
+        self.rows = [int.from_bytes(row.tobytes(), "big") for row in bits]
+
+        ys, xs = np.nonzero(self.unpack())
+        if len(xs):
+            self.left = x0 + int(xs.min())
+            self.top = y0 + int(ys.min())
+            self.right = x0 + int(xs.max()) + 1
+            self.bottom = y0 + int(ys.max()) + 1
+            # 기준점에서 가장 먼 불투명 픽셀 모서리까지의 거리 (공간 해시 후보 반경)
+            far_x = max(-self.left, self.right)
+            far_y = max(-self.top, self.bottom)
+            self.reach = float(np.hypot(far_x, far_y))
+        else:
+            self.left = self.top = self.right = self.bottom = 0
+            self.reach = 0.0
+
+    @classmethod
+    def from_image(cls, img, threshold=MASK_ALPHA_THRESHOLD):
+        if "A" in img.getbands():
+            solid = np.asarray(img.getchannel("A")) >= threshold
+        else:
+            solid = np.ones((img.height, img.width), dtype=bool)
+        return cls(np.packbits(solid, axis=1), img.width, -img.width / 2, -img.height / 2)
+
+    def unpack(self):
+        return np.unpackbits(self.bits, axis=1, count=self.width).astype(bool)
+
+    def dilate(self, r):
+        # 반지름 r 인 원을 마스크에 굴린 모양: 원 중심이 이 안에 있으면 원과 스프라이트가 겹친다
+        solid = self.unpack()
+        h, w = solid.shape
+        out = np.zeros((h + 2 * r, w + 2 * r), dtype=bool)
+        for dy in range(-r, r + 1):
+            for dx in range(-r, r + 1):
+                if dx * dx + dy * dy <= r * r:
+                    out[r + dy:r + dy + h, r + dx:r + dx + w] |= solid
+        return CollisionMask(np.packbits(out, axis=1), w + 2 * r, self.x0 - r, self.y0 - r)
+
+    def contains(self, dx, dy):
+        # 기준점에서 (dx, dy) 만큼 떨어진 점들이 불투명 픽셀 위에 있는지 (배열 모양 그대로)
+        inside = (dx >= self.left) & (dx < self.right) & (dy >= self.top) & (dy < self.bottom)
+        out = np.zeros(inside.shape, dtype=bool)
+        if inside.any():
+            ix = (dx[inside] - self.x0).astype(np.intp)
+            iy = (dy[inside] - self.y0).astype(np.intp)
+            out[inside] = (self.bits[iy, ix >> 3] >> (7 - (ix & 7))) & 1
+        return out
+
+    def segment_hits(self, px, py, x, y, cx, cy):
+        # 선분 (px, py) -> (x, y) 가 기준점 (cx, cy) 에 놓인 마스크의 불투명 픽셀을 지나는지
+        # 선분을 감싸는 사각형이 불투명 영역과 떨어져 있으면 그 선분은 더 보지 않는다
+        if not len(px):
+            return np.zeros(0, dtype=bool)
+        ax = px - cx
+        ay = py - cy
+        bx = x - cx
+        by = y - cy
+        near = ((np.minimum(ax, bx) < self.right) & (np.maximum(ax, bx) >= self.left) &
+                (np.minimum(ay, by) < self.bottom) & (np.maximum(ay, by) >= self.top))
+        hits = np.zeros(near.shape, dtype=bool)
+        if not near.any():
+            return hits
+        ax = ax[near]
+        ay = ay[near]
+        sx = bx[near] - ax
+        sy = by[near] - ay
+        # 선분 위를 MASK_SAMPLE_STEP 픽셀 간격으로 찍어 본다
+        steps = int(np.sqrt((sx * sx + sy * sy).max()) / MASK_SAMPLE_STEP) + 2
+        t = np.linspace(0.0, 1.0, steps)
+        hits[near] = self.contains(ax[:, None] + sx[:, None] * t, ay[:, None] + sy[:, None] * t).any(axis=1)
+        return hits
+
+    def overlaps(self, other, dx, dy):
+        # other 의 기준점이 이 마스크 기준점에서 (dx, dy) 에 있을 때 불투명 픽셀이 하나라도 겹치는지
+        if (other.left + dx >= self.right or other.right + dx <= self.left or
+                other.top + dy >= self.bottom or other.bottom + dy <= self.top):
+            return False
+        ox = int(round(other.x0 + dx - self.x0))
+        oy = int(round(other.y0 + dy - self.y0))
+        # other 의 픽셀 x 는 이 마스크의 픽셀 x + ox 에 놓인다. 행 정수의 비트 자리를 맞춰 AND 한다
+        shift = (self.bits.shape[1] * 8 - ox) - other.bits.shape[1] * 8
+        rows = self.rows
+        other_rows = other.rows
+        for y in range(max(0, oy), min(self.height, oy + other.height)):
+            row = other_rows[y - oy]
+            if row and rows[y] & (row << shift if shift >= 0 else row >> -shift):
+                return True
+        return False
+
+    def to_bytes(self):
+        return f"{self.width} {self.height} {self.x0} {self.y0}\n".encode() + self.bits.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        head, _, body = data.partition(b"\n")
+        w, h, x0, y0 = head.split()
+        h = int(h)
+        bits = np.frombuffer(body, np.uint8).reshape(h, -1).copy()
+        return cls(bits, int(w), float(x0), float(y0))
+
+
+class SpriteMasks:
+    # Simulation 이 쓰는 마스크 묶음. *_bomb 은 폭탄 반지름만큼 부풀린 것
+    def __init__(self, monster, monster_bomb, player_right, player_left, wave_monster, wave_monster_bomb):
+        self.monster = monster
+        self.monster_bomb = monster_bomb
+        self.player_right = player_right
+        self.player_left = player_left
+        self.wave_monster = wave_monster
+        self.wave_monster_bomb = wave_monster_bomb
+
+    def player(self, facing):
+        return self.player_right if facing == "right" else self.player_left
+
+
+def load_sprite_masks(assets):
+    # 이미지가 없으면 None (Simulation 은 원래의 원 판정을 쓴다)
+    # 그리는 쪽과 같은 크기/방향으로 만든다: 오른쪽을 볼 때 뒤집은 player.png 를 그린다
+    monster = assets.load_mask("spaghetti.png", (120, 120))
+    player_left = assets.load_mask("player.png", (40, 40))
+    if monster is None or player_left is None:
+        return None
+    wave_size = (WAVE_MONSTER_SIZE, WAVE_MONSTER_SIZE)
+    return SpriteMasks(
+        monster,
+        assets.load_mask("spaghetti.png", (120, 120), dilate=BOMB_RADIUS),
+        assets.load_mask("player.png", (40, 40), flip=True),
+        player_left,
+        assets.load_mask("spaghetti.png", wave_size),
+        assets.load_mask("spaghetti.png", wave_size, dilate=BOMB_RADIUS),
+    )
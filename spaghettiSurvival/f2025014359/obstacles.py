@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left
+
+
+class ObstacleTrack:
+    # 장애물은 오른쪽 끝에서 x 가 커지는 순서로 생기고 왼쪽부터 사라진다
+    # 그래서 x 로 정렬된 리스트 + head 인덱스를 덱처럼 쓰고
+    # 충돌 검사는 이분 탐색으로 플레이어 근처 몇 개만 본다
+    COMPACT_AT = 64
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.xs = []
+        self.hs = []
+        self.ws = []
+        self.head = 0
+        self.max_w = 0
+
+    def __len__(self):
+        return len(self.xs) - self.head
+
+    def __iter__(self):
+        for i in range(self.head, len(self.xs)):
+            yield self.xs[i], self.hs[i], self.ws[i]
+
+    def add(self, x, h, w):
+        if self.xs and x < self.xs[-1]:
+            i = bisect_left(self.xs, x, self.head)
+            self.xs.insert(i, x)
+            self.hs.insert(i, h)
+            self.ws.insert(i, w)
+        else:
+            self.xs.append(x)
+            self.hs.append(h)
+            self.ws.append(w)
+        if w > self.max_w:
+            self.max_w = w
+
+    def restore(self, xs, hs, ws):
+        # 스냅샷에서 되돌릴 때: 살아 있는 장애물만 x 순서로 받는다
+        self.xs = list(xs)
+        self.hs = list(hs)
+        self.ws = list(ws)
+        self.head = 0
+        self.max_w = max(self.ws, default=0)
+
+    def expire(self, min_x):
+        # x 가 min_x 보다 작은 장애물을 앞에서부터 버린다
+        xs = self.xs
+        head = self.head
+        while head < len(xs) and xs[head] < min_x:
+            head += 1
+        if head >= self.COMPACT_AT and head * 2 >= len(xs):
+            del xs[:head]
+            del self.hs[:head]
+            del self.ws[:head]
+            head = 0
+        self.head = head
+
+    def query(self, left, right):
+        # x 구간 (left, right) 와 겹치는 장애물을 x 순서로 돌려준다
+        xs = self.xs
+        i = bisect_left(xs, left - self.max_w, self.head)
+        while i < len(xs) and xs[i] < right:
+            x = xs[i]
+            w = self.ws[i]
+            if x + w > left:
+                yield x, self.hs[i], w
+            i += 1
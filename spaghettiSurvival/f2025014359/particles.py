@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# 폭탄 폭발 파편
+# 화면 효과일 뿐이라 Simulation 밖에서 렌더러가 들고 있고, 스냅샷/리플레이/되감기 상태에는 들어가지 않는다
+# 파편은 PARTICLE_BUDGET 칸짜리 배열 하나에 담기므로 폭발이 몇 개 겹쳐도 갱신/그리기 비용이 이 이상 늘지 않는다
+import math
+
+import numpy as np
+
+from settings import *
+
+
+class ParticlePool:
+    # 살아 있는 파편은 항상 [0, n) 에 모여 있다 (ProjectilePool 과 같은 방식)
+    def __init__(self, capacity=PARTICLE_BUDGET, seed=None):
+        self.capacity = capacity
+        self.n = 0
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)        # 남은 수명 (초)
+        self.max_life = np.ones(capacity)
+        self.columns = [self.x, self.y, self.vx, self.vy, self.life, self.max_life]
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.n = 0
+
+    def burst(self, x, y, count):
+        # 남은 자리만큼만 만든다. 실제로 만든 수를 돌려준다
+        k = min(count, self.capacity - self.n)
+        if k <= 0:
+            return 0
+        i = self.n
+        j = i + k
+        rng = self.rng
+        angle = rng.uniform(0.0, 2 * math.pi, k)
+        speed = rng.uniform(PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX, k)
+        life = rng.uniform(PARTICLE_LIFE_MIN, PARTICLE_LIFE_MAX, k)
+        self.x[i:j] = x
+        self.y[i:j] = y
+        self.vx[i:j] = np.cos(angle) * speed
+        self.vy[i:j] = np.sin(angle) * speed - PARTICLE_LIFT
+        self.life[i:j] = life
+        self.max_life[i:j] = life
+        self.n = j
+        return k
+
+    def update(self, dt):
+        n = self.n
+        if not n:
+            return
+        vx = self.vx[:n]
+        vy = self.vy[:n]
+        drag = PARTICLE_DRAG ** dt
+        vx *= drag
+        vy *= drag
+        vy += PARTICLE_GRAVITY * dt
+        self.x[:n] += vx * dt
+        self.y[:n] += vy * dt
+        life = self.life[:n]
+        life -= dt
+        alive = life > 0
+        if not alive.all():
+            self.compact(alive)
+
+    def compact(self, keep):
+        idx = np.flatnonzero(keep)
+        k = len(idx)
+        if k == self.n:
+            return
+        for col in self.columns:
+            col[:k] = col[idx]
+        self.n = k
+
+    def stages(self):
+        # 파편별 색 단계 (0 = 막 튄 것 ... len(PARTICLE_COLORS) - 1 = 꺼져 가는 것)
+        n = self.n
+        age = 1.0 - self.life[:n] / self.max_life[:n]
+        return np.minimum((age * len(PARTICLE_COLORS)).astype(np.intp), len(PARTICLE_COLORS) - 1)
+
+
+class ExplosionEffects:
+    # 렌더러가 그릴 때마다 g 를 보고 새로 터진 폭탄 자리에 파편을 뿌린다
+    # 파편은 게임 시간(g.time)으로 움직인다: 일시정지면 멈추고, 되감거나 새 판이 시작되면 지운다
+    def __init__(self, budget=PARTICLE_BUDGET):
+        self.particles = ParticlePool(budget)
+        self.last_time = 0.0
+        self.dropped = 0        # 예산이 모자라 만들지 못한 파편 수
+
+    def update(self, g):
+        now = g.time
+        if now < self.last_time:
+            self.particles.clear()
+        elif now > self.last_time:
+            bombs = g.bombs
+            n = bombs.n
+            if n:
+                # explode_time 은 터진 틱의 게임 시간이다
+                new = bombs.exploded[:n] & (bombs.explode_time[:n] > self.last_time)
+                if new.any():
+                    for x, y in zip(bombs.x[:n][new].tolist(), bombs.y[:n][new].tolist()):
+                        self.dropped += PARTICLES_PER_BLAST - self.particles.burst(x, y, PARTICLES_PER_BLAST)
+            self.particles.update(now - self.last_time)
+        self.last_time = now
+
+    def clear(self):
+        self.particles.clear()
+        self.last_time = 0.0
+
+    def groups(self, cam):
+        # 색 단계별 (단계, 화면 x 목록, y 목록). 렌더러는 단계마다 같은 색 아이템만 재사용한다
+        p = self.particles
+        n = p.n
+        if not n:
+            return []
+        stage = p.stages()
+        xs = p.x[:n] - cam
+        ys = p.y[:n]
+        out = []
+        for k in range(len(PARTICLE_COLORS)):
+            sel = stage == k
+            if sel.any():
+                out.append((k, xs[sel].tolist(), ys[sel].tolist()))
+        return out
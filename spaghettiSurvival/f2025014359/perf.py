@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import time
+
+
+class StartupTimer:
+    # 실행 시작부터 첫 화면까지 단계별로 걸린 시간을 기록한다
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    @property
+    def total(self):
+        return self.last - self.start
+
+    def report(self):
+        lines = [f"{name:<24}{sec * 1000:8.1f} ms" for name, sec in self.phases]
+        lines.append(f"{'합계':<24}{self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+# 프레임 단계
+P_INPUT = 0
+P_PHYSICS = 1
+P_OBSTACLES = 2
+P_BULLETS = 3
+P_BOMBS = 4
+P_RENDER = 5
+P_PRESENT = 6      # 화면에 반영 (Tk update_idletasks / pygame display.update)
+P_SNAPSHOT = 7     # 되감기용 상태 저장 / 되돌리기
+PHASE_NAMES = ("input", "physics", "obstacles", "bullets", "bombs", "render", "present", "snapshot")
+
+
+class FrameProfiler:
+    # 프레임마다 단계별 시간을 고정 크기 링 버퍼에 남긴다
+    # lap(phase) 는 직전 lap 이후 흐른 시간을 그 단계에 더한다
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.phases = [[0.0] * len(PHASE_NAMES) for _ in range(capacity)]
+        self.frame_time = [0.0] * capacity
+        self.interval = [0.0] * capacity
+        self.counts = [(0, 0, 0)] * capacity
+        self.index = 0
+        self.filled = 0
+        self.row = self.phases[0]
+        self.frame_start = None
+        self.last = 0.0
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        i = self.index
+        self.interval[i] = now - self.frame_start if self.frame_start is not None else 0.0
+        self.row = self.phases[i]
+        for p in range(len(self.row)):
+            self.row[p] = 0.0
+        self.frame_start = self.last = now
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.row[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self, bullets=0, bombs=0, obstacles=0):
+        i = self.index
+        self.frame_time[i] = time.perf_counter() - self.frame_start
+        self.counts[i] = (bullets, bombs, obstacles)
+        self.index = (i + 1) % self.capacity
+        self.filled = min(self.filled + 1, self.capacity)
+
+    def pause(self):
+        # 메뉴 화면 등으로 루프가 멈추면 다음 프레임 간격을 재지 않는다
+        self.frame_start = None
+
+    def recent(self, count):
+        count = min(count, self.filled)
+        return [(self.index - 1 - k) % self.capacity for k in range(count)]
+
+    def summary(self, count=60):
+        rows = self.recent(count)
+        if not rows:
+            return None
+        n = len(rows)
+        frame_ms = sum(self.frame_time[i] for i in rows) / n * 1000
+        intervals = [self.interval[i] for i in rows if self.interval[i] > 0]
+        fps = len(intervals) / sum(intervals) if intervals else 0.0
+        phase_ms = [sum(self.phases[i][p] for i in rows) / n * 1000 for p in range(len(PHASE_NAMES))]
+        slowest = max(range(len(PHASE_NAMES)), key=lambda p: phase_ms[p])
+        return {
+            "frame_ms": frame_ms,
+            "worst_ms": max(self.frame_time[i] for i in rows) * 1000,
+            "fps": fps,
+            "phase_ms": dict(zip(PHASE_NAMES, phase_ms)),
+            "slowest": PHASE_NAMES[slowest],
+            "slowest_ms": phase_ms[slowest],
+            "counts": self.counts[rows[0]],
+        }
+
+    def dump_csv(self, path):
+        rows = list(reversed(self.recent(self.filled)))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("frame,interval_ms,frame_ms," + ",".join(f"{p}_ms" for p in PHASE_NAMES) + ",bullets,bombs,obstacles\n")
+            for n, i in enumerate(rows):
+                cells = [str(n), f"{self.interval[i] * 1000:.4f}", f"{self.frame_time[i] * 1000:.4f}"]
+                cells += [f"{t * 1000:.4f}" for t in self.phases[i]]
+                cells += [str(c) for c in self.counts[i]]
+                f.write(",".join(cells) + "\n")
+        return len(rows)
+
+
+def summary_lines(s, voices=None, pacer=None):
+    # FrameProfiler.summary() -> 오버레이에 찍을 줄들
+    if s is None:
+        return None
+    bullets, bombs, obstacles = s["counts"]
+    lines = [
+        f"frame {s['frame_ms']:5.2f} ms  worst {s['worst_ms']:5.2f}",
+        f"fps   {s['fps']:5.1f}",
+        f"총알 {bullets}  폭탄 {bombs}  장애물 {obstacles}",
+        f"slowest {s['slowest']} {s['slowest_ms']:.2f} ms",
+    ]
+    phases = [f"{name[:4]} {ms:.2f}" for name, ms in s["phase_ms"].items()]
+    lines.append("  ".join(phases[:4]))
+    lines.append("  ".join(phases[4:]))
+    if voices:
+        lines.append(f"소리 재생 {voices['played']} 합침 {voices['coalesced']} "
+                     f"버림 {voices['dropped']} 끊음 {voices['stolen']}")
+    if pacer:
+        lines.append(f"품질 {pacer.level} {pacer.level_name}  부하 {pacer.load * 100:.0f}%  건너뜀 {pacer.skipped}")
+    return lines
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import math
+
+import numpy as np
+
+
+def segment_dist_sq(px, py, x, y, cx, cy):
+    # 선분 (px, py) -> (x, y) 와 점 (cx, cy) 사이 거리의 제곱
+    sx = x - px
+    sy = y - py
+    fx = cx - px
+    fy = cy - py
+    seg_len2 = np.maximum(sx * sx + sy * sy, 1e-9)
+    t = np.clip((fx * sx + fy * sy) / seg_len2, 0.0, 1.0)
+    ex = fx - t * sx
+    ey = fy - t * sy
+    return ex * ex + ey * ey
+
+
+class ProjectilePool:
+    # 투사체를 고정 크기 배열(struct-of-arrays)에 담아 한꺼번에 갱신한다
+    # 살아 있는 항목은 항상 [0, n) 에 모여 있다
+    def __init__(self, capacity, speed):
+        self.capacity = capacity
+        self.speed = speed
+        self.n = 0
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.px = np.zeros(capacity)    # 직전 틱 위치 (스윕 판정용)
+        self.py = np.zeros(capacity)
+        self.dx = np.zeros(capacity)    # 진행 방향 cos / sin
+        self.dy = np.zeros(capacity)
+        self.columns = [self.x, self.y, self.px, self.py, self.dx, self.dy]
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.n = 0
+
+    def spawn(self, x, y, angle):
+        # 가득 차 있으면 새 투사체는 버린다
+        if self.n == self.capacity:
+            return -1
+        i = self.n
+        self.x[i] = self.px[i] = x
+        self.y[i] = self.py[i] = y
+        self.dx[i] = math.cos(angle)
+        self.dy[i] = math.sin(angle)
+        self.n = i + 1
+        return i
+
+    def integrate(self, moving=None):
+        n = self.n
+        self.px[:n] = self.x[:n]
+        self.py[:n] = self.y[:n]
+        step = self.speed if moving is None else self.speed * moving
+        self.x[:n] += self.dx[:n] * step
+        self.y[:n] += self.dy[:n] * step
+
+    def segment_hits(self, cx, cy, r):
+        # 직전 위치 -> 현재 위치 선분과 원 (cx, cy, r) 의 교차 여부
+        n = self.n
+        return segment_dist_sq(self.px[:n], self.py[:n], self.x[:n], self.y[:n], cx, cy) < r * r
+
+    def mask_hits(self, mask, cx, cy):
+        # 직전 위치 -> 현재 위치 선분과 기준점 (cx, cy) 에 놓인 CollisionMask 의 교차 여부
+        n = self.n
+        return mask.segment_hits(self.px[:n], self.py[:n], self.x[:n], self.y[:n], cx, cy)
+
+    def outside(self, left, top, right, bottom):
+        n = self.n
+        x = self.x[:n]
+        y = self.y[:n]
+        return (x < left) | (x > right) | (y < top) | (y > bottom)
+
+    def compact(self, keep):
+        # keep 이 True 인 항목만 앞으로 당겨 모은다 (순서 유지)
+        idx = np.flatnonzero(keep)
+        k = len(idx)
+        if k == self.n:
+            return
+        for col in self.columns:
+            col[:k] = col[idx]
+        self.n = k
+
+
+class BombPool(ProjectilePool):
+    def __init__(self, capacity, speed):
+        super().__init__(capacity, speed)
+        self.tx = np.zeros(capacity)
+        self.ty = np.zeros(capacity)
+        self.exploded = np.zeros(capacity, dtype=bool)
+        self.explode_time = np.zeros(capacity)
+        self.columns += [self.tx, self.ty, self.exploded, self.explode_time]
+
+    def spawn(self, x, y, target_x, target_y):
+        i = super().spawn(x, y, math.atan2(target_y - y, target_x - x))
+        if i >= 0:
+            self.tx[i] = target_x
+            self.ty[i] = target_y
+            self.exploded[i] = False
+            self.explode_time[i] = 0
+        return i
+
+    def dist_sq_to_target(self):
+        n = self.n
+        ex = self.x[:n] - self.tx[:n]
+        ey = self.y[:n] - self.ty[:n]
+        return ex * ex + ey * ey
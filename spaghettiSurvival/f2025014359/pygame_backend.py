@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+# pygame 창으로 그리는 백엔드 (python spaghettiSurvival.py --backend pygame)
+# 판 진행(session.GameSession: 메뉴, 틱 루프, 기록, 소리)은 Tk 쪽과 같은 것을 쓰고 화면과 입력만 pygame 으로 바꾼다
+import os
+import time
+
+import pygame
+
+from settings import *
+from scenes import HELP_INSTRUCTIONS
+from timestep import Q_STATIC_BG, Q_SIMPLE_BULLETS, Q_THIN_HUD
+from ranking import format_time
+from assets import AssetCache
+from particles import ExplosionEffects
+from masks import load_sprite_masks
+from perf import StartupTimer, summary_lines
+from session import GameSession, start_sounds
+from simulation import InputState
+
+# 한글이 나오는 글꼴을 먼저 찾는다
+FONT_NAMES = "malgungothic,applegothic,nanumgothic,notosanscjkkr,notosanskr,notosanscjk"
+
+
+def to_surface(img, alpha=True):
+    # PIL 이미지 (AssetCache 결과) -> 화면 형식으로 변환해 둔 Surface
+    if img is None:
+        return None
+    img = img.convert("RGBA")
+    surface = pygame.image.frombuffer(img.tobytes(), img.size, "RGBA")
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+class PygameRenderer:
+    # CanvasRenderer.draw 와 같은 장면을 Surface 에 그린다
+    # 카메라가 그대로면 직전 프레임에 그린 영역만 배경으로 지우고 다시 그려서 그 사각형들만 화면에 올린다
+    # 카메라가 움직이면 배경 전체가 밀리므로 한 장을 통째로 올린다
+    # 사각형이 DIRTY_LIMIT 개를 넘으면 하나씩 지우는 것보다 배경 한 장을 다시 까는 편이 빠르다
+    DIRTY_LIMIT = 200
+
+    def __init__(self, screen, ingame_bg=None, monster=None, player_right=None, player_left=None, wave_monster=None):
+        self.screen = screen
+        self.ingame_bg = ingame_bg
+        self.monster = monster
+        self.player_right = player_right
+        self.player_left = player_left
+        self.wave_monster = wave_monster
+        self.effects = ExplosionEffects()
+        # 파편은 색 단계마다 미리 칠해 둔 작은 Surface 를 blits 한 번으로 찍는다
+        self.sparks = []
+        for color, r in zip(PARTICLE_COLORS, PARTICLE_SIZES):
+            spark = pygame.Surface((2 * r, 2 * r)).convert()
+            spark.fill(color)
+            self.sparks.append(spark)
+
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.last_cam = None
+        self.prev_rects = []
+        self.font = pygame.font.SysFont(FONT_NAMES, 18, bold=True)
+        self.small_font = pygame.font.SysFont(FONT_NAMES, 13)
+        self.status_font = pygame.font.SysFont(FONT_NAMES, 28, bold=True)
+        self.texts = {}
+        # FramePacer 단계에 따라 set_quality() 가 바꾼다
+        self.parallax = True
+        self.bullet_width = 3
+        self.hud_every = 1
+        self.hud_count = 0
+        self.hud = None
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        # 다른 화면을 그린 뒤에는 다음 프레임을 통째로 다시 그린다
+        self.last_cam = None
+        self.prev_rects = []
+        self.hud_count = 0
+
+    def set_quality(self, level):
+        # 배경을 고정하면 카메라가 움직여도 배경을 다시 만들지 않으니 바뀐 영역만 올릴 수 있다
+        self.parallax = level < Q_STATIC_BG
+        self.bullet_width = 1 if level >= Q_SIMPLE_BULLETS else 3
+        self.hud_every = PACE_HUD_EVERY if level >= Q_THIN_HUD else 1
+        self.hud_count = 0
+
+    def text(self, text, color="black", font=None):
+        key = (text, color, font)
+        surface = self.texts.get(key)
+        if surface is None:
+            if len(self.texts) > 256:
+                self.texts.clear()
+            surface = (font or self.font).render(text, True, color)
+            self.texts[key] = surface
+        return surface
+
+    def _build_background(self, cam):
+        bg = self.background
+        if self.ingame_bg:
+            shift = (cam * BG_SPEED_FACTOR) % SCREEN_WIDTH
+            bg.blit(self.ingame_bg, (-shift, 0))
+            bg.blit(self.ingame_bg, (-shift + SCREEN_WIDTH, 0))
+        else:
+            bg.fill("#87CEEB")
+        bg.fill("#228B22", (0, GROUND_Y, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_Y))
+
+    def draw(self, g, alpha=1.0, overlay=None, status=None):
+        # 화면에 올려야 할 사각형 목록을 돌려준다
+        screen = self.screen
+        back = 1.0 - alpha
+        cam = g.scroll_x - back * (g.scroll_x - g.prev_scroll_x)
+
+        # HUD 값은 hud_every 프레임마다 한 번만 새로 읽는다 (그 사이에는 같은 글자 Surface 를 다시 쓴다)
+        if self.hud_count == 0 or self.hud is None:
+            self.hud = self._hud_values(g)
+        self.hud_count = (self.hud_count + 1) % self.hud_every
+        left, wave_label, bomb_label, ammo_label = self.hud
+
+        rebuild = self.last_cam is None or (self.parallax and cam != self.last_cam)
+        full = rebuild or len(self.prev_rects) > self.DIRTY_LIMIT
+        if rebuild:
+            self.last_cam = cam
+            self._build_background(cam)
+        if full:
+            screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.prev_rects:
+                screen.blit(self.background, rect, rect)
+
+        rects = []
+        add = rects.append
+
+        for x, h, w in g.obstacles.query(cam, cam + SCREEN_WIDTH):
+            r = (x - cam, GROUND_Y - h, w, h)
+            add(screen.fill("black", r))
+            pygame.draw.rect(screen, "white", r, 1)
+
+        if g.mode == "wave":
+            self._draw_wave(g, back, cam, add)
+        else:
+            self._draw_monster(g, back, cam, add)
+
+        p_x = g.p_x - back * (g.p_x - g.prev_p_x) - cam
+        p_y = g.p_y - back * (g.p_y - g.prev_p_y)
+        if self.player_right and self.player_left:
+            img = self.player_right if g.facing == 'right' else self.player_left
+            add(screen.blit(img, img.get_rect(center=(p_x, p_y - 20))))
+        else:
+            add(pygame.draw.ellipse(screen, "blue", (p_x - 20, p_y - 40, 40, 40)))
+
+        bullets = g.bullets
+        n = bullets.n
+        if n:
+            dx = bullets.dx[:n]
+            dy = bullets.dy[:n]
+            bullet_back = back * BULLET_SPEED
+            x0 = bullets.x[:n] - dx * bullet_back - cam
+            y0 = bullets.y[:n] - dy * bullet_back
+            line = pygame.draw.line
+            width = self.bullet_width
+            for ax, ay, bx, by in zip(x0.tolist(), y0.tolist(), (x0 + dx * 10).tolist(), (y0 + dy * 10).tolist()):
+                add(line(screen, "yellow", (ax, ay), (bx, by), width))
+
+        bombs = g.bombs
+        n = bombs.n
+        if n:
+            flying = ~bombs.exploded[:n]
+            bomb_back = back * BOMB_SPEED
+            xs = (bombs.x[:n] - bombs.dx[:n] * bomb_back - cam)[flying].tolist()
+            ys = (bombs.y[:n] - bombs.dy[:n] * bomb_back)[flying].tolist()
+            for x, y in zip(xs, ys):
+                add(pygame.draw.circle(screen, "black", (x, y), 10))
+
+        self.effects.update(g)
+        groups = self.effects.groups(cam)
+        if groups:
+            blits = []
+            for k, xs, ys in groups:
+                spark = self.sparks[k]
+                r = PARTICLE_SIZES[k]
+                blits.extend((spark, (x - r, y - r)) for x, y in zip(xs, ys))
+            # 파편마다 사각형을 넣으면 DIRTY_LIMIT 를 금방 넘으므로 하나로 합쳐서 올린다
+            areas = screen.blits(blits)
+            add(areas[0].unionall(areas[1:]))
+
+        add(screen.fill("gray", (100, 20, 600, 15)))
+        if left > 0:
+            screen.fill("red", (100, 20, 600 * left, 15))
+        if wave_label:
+            add(screen.blit(wave_label, (100, 50)))
+        add(screen.blit(bomb_label, (600, 50)))
+        add(screen.blit(ammo_label, (600, 75)))
+
+        if status:
+            text = self.text(status, "red", self.status_font)
+            add(screen.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, 130))))
+        if overlay:
+            add(self._draw_overlay(overlay))
+
+        if full or len(rects) > self.DIRTY_LIMIT:
+            dirty = [screen.get_rect()]
+            self.full_updates += 1
+        else:
+            dirty = self.prev_rects + rects
+            self.partial_updates += 1
+        self.prev_rects = rects
+        return dirty
+
+    def _hud_values(self, g):
+        if g.mode == "wave":
+            left = g.monsters.n / g.wave_size if g.wave_size else 0
+            wave_label = self.text(f"웨이브 {g.wave} / {WAVE_COUNT}   남은 괴물 {g.monsters.n}")
+        else:
+            left = max(0, g.m_hp / g.balance.monster_max_hp)
+            wave_label = None
+        bomb_label = self.text(f"폭탄: {g.bomb_count} / {BOMB_MAX_COUNT}")
+        if g.is_reloading:
+            ammo_label = self.text("재장전 중...", "red")
+        else:
+            ammo_label = self.text(f"총알: {g.ammo} / {PLAYER_MAX_AMMO}")
+        self.hp_label = self.text(f"HP: {g.m_hp}", "red")
+        return left, wave_label, bomb_label, ammo_label
+
+    def _draw_monster(self, g, back, cam, add):
+        screen = self.screen
+        m_x = g.m_x - back * (g.m_x - g.prev_m_x) - cam
+        m_y = g.m_y - back * (g.m_y - g.prev_m_y)
+        if self.monster:
+            add(screen.blit(self.monster, self.monster.get_rect(center=(m_x, m_y))))
+        else:
+            add(pygame.draw.ellipse(screen, "gray" if g.m_stunned else "red", (m_x - 60, m_y - 60, 120, 120)))
+
+        label = self.hp_label
+        add(screen.blit(label, label.get_rect(center=(m_x, m_y - 80))))
+        if g.m_stunned:
+            label = self.text("기절!", "red")
+            add(screen.blit(label, label.get_rect(center=(m_x, m_y))))
+
+    def _draw_wave(self, g, back, cam, add):
+        screen = self.screen
+        m = g.monsters
+        n = m.n
+        if not n:
+            return
+        r = WAVE_MONSTER_RADIUS
+        xs = m.x[:n] - back * (m.x[:n] - m.px[:n]) - cam
+        ys = m.y[:n] - back * (m.y[:n] - m.py[:n])
+        visible = (xs > -r) & (xs < SCREEN_WIDTH + r)
+        img = self.wave_monster
+        for x, y in zip(xs[visible].tolist(), ys[visible].tolist()):
+            if img:
+                add(screen.blit(img, (x - r, y - r)))
+            else:
+                add(pygame.draw.ellipse(screen, "red", (x - r, y - r, 2 * r, 2 * r)))
+
+    def _draw_overlay(self, lines):
+        box = pygame.Rect(5, 45, 320, 8 + 16 * len(lines))
+        self.screen.fill("black", box)
+        for i, line in enumerate(lines):
+            self.screen.blit(self.text(line, "#00ff00", self.small_font), (12, 50 + i * 16))
+        return box
+
+
+# pygame 키 -> GameSession.press 가 받는 이름
+KEY_NAMES = {pygame.K_UP: "up", pygame.K_DOWN: "down", pygame.K_SPACE: "space", pygame.K_RETURN: "return",
+             pygame.K_ESCAPE: "escape", pygame.K_p: "p", pygame.K_F4: "f4"}
+
+
+class PygameGame(GameSession):
+    # 판 진행은 Tk 의 Game 과 같은 GameSession 이 하고, 여기서는 pygame 이벤트 루프와 그리기만 한다
+    def __init__(self, startup_report=False, record_path=None, mode="classic", launch_time=None):
+        self.startup = StartupTimer(launch_time)
+        self.startup.mark("모듈 import")
+        base_path = os.path.dirname(os.path.abspath(__file__))
+
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("스파게티 괴물 죽이기")
+        self.startup.mark("pygame 창 생성")
+
+        sounds = start_sounds(base_path)
+        self.startup.mark("오디오 스레드 시작")
+
+        self.assets = AssetCache(base_path)
+        self.menu_bg = to_surface(self.assets.load("menu_bg.png"), alpha=False)
+        player = self.assets.load("player.png", (40, 40))
+        self.renderer = PygameRenderer(
+            self.screen,
+            ingame_bg=to_surface(self.assets.load("ingame_bg.png", (SCREEN_WIDTH, SCREEN_HEIGHT)), alpha=False),
+            monster=to_surface(self.assets.load("spaghetti.png", (120, 120))),
+            player_right=to_surface(self.assets.load("player.png", (40, 40), flip=True)) if player is not None else None,
+            player_left=to_surface(player),
+            wave_monster=to_surface(self.assets.load("spaghetti.png", (WAVE_MONSTER_SIZE, WAVE_MONSTER_SIZE))),
+        )
+        masks = load_sprite_masks(self.assets)
+        self.title_font = pygame.font.SysFont(FONT_NAMES, 36, bold=True)
+        self.menu_font = pygame.font.SysFont(FONT_NAMES, 30, bold=True)
+        self.body_font = pygame.font.SysFont(FONT_NAMES, 20)
+        self.startup.mark("이미지/글꼴 로드")
+
+        super().__init__(base_path, sounds, masks, record_path, mode)
+        self.sim.profiler = self.profiler
+        self.scene_dirty = True
+        self.show_profiler = False
+        self.overlay_lines = None
+        self.overlay_countdown = 0
+        self.dirty = None
+
+        self.startup_report = startup_report
+        self.main_loop()
+
+    def main_loop(self):
+        clock = pygame.time.Clock()
+        last = time.perf_counter()
+        while self.running:
+            for event in pygame.event.get():
+                self.handle_event(event)
+            if not self.running:
+                break
+
+            now = time.perf_counter()
+            frame_dt = now - last
+            last = now
+            if self.state == "PLAY":
+                self.play_frame(frame_dt)
+                clock.tick(MAX_RENDER_FPS)
+            else:
+                if self.scene_dirty:
+                    self.draw_scene()
+                    pygame.display.flip()
+                    self.scene_dirty = False
+                    self.finish_startup()
+                clock.tick(30)
+        self.on_close()
+
+    def finish_startup(self):
+        if not self.startup:
+            return
+        self.startup.mark("첫 화면")
+        if self.startup_report:
+            print(self.startup.report())
+        self.startup = None
+
+    def draw_game(self, status=None):
+        # 멈춰 있거나 되감는 중에는 틱 사이 보간 없이 스냅샷 그대로 그린다
+        self.update_overlay()
+        alpha = 1.0 if status else self.timestep.alpha
+        self.dirty = self.renderer.draw(self.sim, alpha, self.overlay_lines, status)
+
+    def present(self):
+        # 바뀐 영역만 화면에 올린다
+        pygame.display.update(self.dirty)
+
+    def update_overlay(self):
+        if not self.show_profiler:
+            self.overlay_lines = None
+            return
+        self.overlay_countdown -= 1
+        if self.overlay_countdown <= 0:
+            self.overlay_countdown = 15
+            self.overlay_lines = summary_lines(self.profiler.summary(), self.sounds.voice_stats(), self.pacer)
+
+    def set_state(self, state):
+        super().set_state(state)
+        if state == "PLAY":
+            self.renderer.invalidate()
+        else:
+            self.scene_dirty = True
+
+    def update_scene(self):
+        self.scene_dirty = True
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+            self.request_bomb()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F3:
+                self.show_profiler = not self.show_profiler
+                self.overlay_countdown = 0
+            self.press(KEY_NAMES.get(event.key))
+
+    def poll_input(self):
+        keys = pygame.key.get_pressed()
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        return InputState(
+            left=keys[pygame.K_a],
+            right=keys[pygame.K_d],
+            jump=keys[pygame.K_w] or keys[pygame.K_SPACE],
+            reload=keys[pygame.K_s],
+            fire=pygame.mouse.get_pressed()[0],
+            mouse_x=mouse_x,
+            mouse_y=mouse_y,
+        )
+
+    def rewind_held(self):
+        return pygame.key.get_pressed()[pygame.K_r]
+
+    def on_close(self):
+        self.shutdown()
+        pygame.quit()
+
+    # 메뉴/도움말/기록/결과 화면은 바뀔 때만 통째로 다시 그린다
+    def draw_scene(self):
+        screen = self.screen
+        if self.state == "MENU":
+            if self.menu_bg:
+                screen.blit(self.menu_bg, (0, 0))
+            else:
+                screen.fill("#f0f0f0")
+            for i, option in enumerate(self.menu_options):
+                selected = i == self.menu_index
+                text = ("▶ " if selected else "") + option
+                y = 180 + i * 60
+                screen.blit(self.menu_font.render(text, True, "black"), (102, y - 18))
+                screen.blit(self.menu_font.render(text, True, "red" if selected else "white"), (100, y - 20))
+        elif self.state == "HELP":
+            screen.fill("#FFE4B5")
+            self._center(self.title_font.render("< 게임 조작법 >", True, "black"), 60)
+            for i, (action, key) in enumerate(HELP_INSTRUCTIONS):
+                y = 150 + i * 45
+                label = self.body_font.render(action, True, "#8B4513")
+                screen.blit(label, label.get_rect(midright=(250, y)))
+                screen.blit(self.body_font.render(":", True, "black"), (276, y - 12))
+                screen.blit(self.body_font.render(key, True, "black"), (310, y - 12))
+            self._center(self.body_font.render("Press ESC to return", True, "gray"), 420)
+        elif self.state == "RANK":
+            screen.fill("#eeeeee")
+            self._center(self.title_font.render("순 위", True, "black"), 50)
+            for i, ms in enumerate(self.ranking.top()):
+                self._center(self.body_font.render(f"{i+1}. {format_time(ms)}", True, "black"), 120 + i * 30)
+            self._center(self.body_font.render("Press ESC to return", True, "gray"), 450)
+        elif self.state in ("GAME_OVER", "CLEAR"):
+            if self.state == "GAME_OVER":
+                screen.fill("black")
+                title, sub = "GAME OVER", "스파게티에게 잡혔습니다."
+            else:
+                screen.fill("#87CEEB")
+                title, sub = "CLEAR!", f"기록: {self.end_time_str}"
+            self._center(self.title_font.render(title, True, "white"), 200)
+            self._center(self.body_font.render(sub, True, "white"), 300)
+            self._center(self.body_font.render("Press SPACE to Menu", True, "white"), 400)
+
+    def _center(self, surface, y):
+        self.screen.blit(surface, surface.get_rect(center=(SCREEN_WIDTH // 2, y)))
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+from bisect import insort
+
+LEGACY_PATTERN = re.compile(r"(\d+)\D+(\d+)\D+(\d+)")
+
+
+def format_time(ms):
+    # 밀리초 -> "02분 39초 84" (기존 ranking.txt 와 같은 모양, 마지막은 1/100 초)
+    mins = ms // 60000
+    secs = ms // 1000 % 60
+    cents = ms % 1000 // 10
+    return f"{mins:02d}분 {secs:02d}초 {cents:02d}"
+
+
+def parse_legacy(line):
+    m = LEGACY_PATTERN.search(line)
+    if not m:
+        return None
+    mins, secs, cents = (int(v) for v in m.groups())
+    return mins * 60000 + secs * 1000 + cents * 10
+
+
+class RankingStore:
+    # 기록은 밀리초 정수로 다루고 상위 top_n 개만 메모리에 정렬해 둔다
+    # 파일(ranking.log)은 한 줄에 기록 하나를 덧붙이는 로그이고
+    # 줄이 compact_every 개 쌓이면 상위 기록만 남기고 다시 쓴다
+    def __init__(self, base_path, top_n=10, compact_every=100,
+                 log_name="ranking.log", legacy_name="ranking.txt"):
+        self.path = os.path.join(base_path, log_name)
+        self.legacy_path = os.path.join(base_path, legacy_name)
+        self.top_n = top_n
+        self.compact_every = compact_every
+        self.version = 0
+        self.log_lines = 0
+        self._top = None
+
+    def top(self):
+        if self._top is None:
+            self._load()
+        return self._top
+
+    def add(self, ms):
+        top = self.top()
+        try:
+            with open(self.path, "a", encoding='utf-8') as f:
+                f.write(f"{ms}\n")
+            self.log_lines += 1
+        except OSError:
+            pass
+
+        if len(top) < self.top_n or ms < top[-1]:
+            insort(top, ms)
+            del top[self.top_n:]
+            self.version += 1
+
+        if self.log_lines >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding='utf-8') as f:
+                f.writelines(f"{ms}\n" for ms in self.top())
+            os.replace(tmp_path, self.path)
+            self.log_lines = len(self._top)
+        except OSError:
+            pass
+
+    def _load(self):
+        records = []
+        self.log_lines = 0
+        migrate = False
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.isdigit():
+                        records.append(int(line))
+                        self.log_lines += 1
+        elif os.path.exists(self.legacy_path):
+            records = self._read_legacy()
+            migrate = True
+
+        records.sort()
+        self._top = records[:self.top_n]
+        self.version += 1
+        if migrate:
+            self.compact()
+
+    def _read_legacy(self):
+        # 예전 "MM분 SS초 CC" 문자열 기록을 밀리초로 읽는다 (원본 파일은 그대로 둔다)
+        records = []
+        with open(self.legacy_path, "r", encoding='utf-8') as f:
+            for line in f:
+                ms = parse_legacy(line)
+                if ms is not None:
+                    records.append(ms)
+        return records
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+from tkinter import NW, HIDDEN, NORMAL
+
+from settings import *
+from perf import summary_lines
+from particles import ExplosionEffects
+from timestep import Q_STATIC_BG, Q_SIMPLE_BULLETS, Q_THIN_HUD
+
+
+class ItemPool:
+    # 같은 종류의 캔버스 아이템을 재사용하는 풀
+    # marker 바로 아래에 새 아이템을 끼워 넣어서 레이어 순서를 유지한다
+    def __init__(self, canvas, marker, factory):
+        self.canvas = canvas
+        self.marker = marker
+        self.factory = factory
+        self.items = []
+        self.used = 0
+        self.visible = 0
+
+    def begin(self):
+        self.used = 0
+
+    def take(self):
+        i = self.used
+        if i == len(self.items):
+            item = self.factory()
+            self.canvas.tag_lower(item, self.marker)
+            self.items.append(item)
+        elif i >= self.visible:
+            self.canvas.itemconfigure(self.items[i], state=NORMAL)
+        self.used = i + 1
+        if self.used > self.visible:
+            self.visible = self.used
+        return self.items[i]
+
+    def end(self):
+        for item in self.items[self.used:self.visible]:
+            self.canvas.itemconfigure(item, state=HIDDEN)
+        self.visible = self.used
+
+    def reset(self):
+        # 레이어 전체가 숨겨진 뒤에 호출
+        self.used = 0
+        self.visible = 0
+
+
+class CanvasRenderer:
+    # 매 프레임 delete("all") 후 다시 만드는 대신
+    # 아이템을 한 번 만들어 두고 coords / itemconfig 로만 갱신한다
+    def __init__(self, canvas, ingame_bg_image=None, monster_img=None,
+                 player_img_right=None, player_img_left=None, wave_monster_img=None):
+        self.canvas = canvas
+        self.ingame_bg_image = ingame_bg_image
+        self.monster_img = monster_img
+        self.player_img_right = player_img_right
+        self.player_img_left = player_img_left
+        self.wave_monster_img = wave_monster_img
+
+        self.shown = False
+        self.last = {}
+        # FramePacer 단계에 따라 set_quality() 가 바꾼다
+        self.parallax = True
+        self.bullet_width = 3
+        self.hud_every = 1
+        self.hud_count = 0
+
+        c = canvas
+        fixed = ("game", "game_fixed")
+
+        if ingame_bg_image:
+            self.bg = [
+                c.create_image(0, 0, image=ingame_bg_image, anchor=NW, tags=fixed),
+                c.create_image(SCREEN_WIDTH, 0, image=ingame_bg_image, anchor=NW, tags=fixed),
+            ]
+        else:
+            self.bg = [c.create_rectangle(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, fill="#87CEEB", tags=fixed)]
+
+        c.create_rectangle(0, GROUND_Y, SCREEN_WIDTH, SCREEN_HEIGHT, fill="#228B22", tags=fixed)
+
+        obs_marker = self._marker()
+        self.obstacles = ItemPool(c, obs_marker, lambda: c.create_rectangle(
+            0, 0, 0, 0, fill="black", outline="white", tags="game"))
+
+        wave_marker = self._marker()
+        if wave_monster_img:
+            self.wave_monsters = ItemPool(c, wave_marker, lambda: c.create_image(
+                0, 0, image=wave_monster_img, tags="game"))
+        else:
+            self.wave_monsters = ItemPool(c, wave_marker, lambda: c.create_oval(
+                0, 0, 0, 0, fill="red", tags="game"))
+
+        if monster_img:
+            self.monster = c.create_image(0, 0, image=monster_img, tags=fixed)
+        else:
+            self.monster = c.create_oval(0, 0, 0, 0, fill="red", tags=fixed + ("monster",))
+        self.monster_hp = c.create_text(0, 0, text="", fill="red", font="bold", tags=fixed)
+        self.monster_stun = c.create_text(0, 0, text="기절!", fill="red", tags="game")
+
+        if player_img_right and player_img_left:
+            self.player = c.create_image(0, 0, image=player_img_right, tags=fixed)
+        else:
+            self.player = c.create_oval(0, 0, 0, 0, fill="blue", tags=fixed + ("player",))
+
+        bullet_marker = self._marker()
+        self.bullets = ItemPool(c, bullet_marker, lambda: c.create_line(
+            0, 0, 0, 0, fill="yellow", width=self.bullet_width, tags="game"))
+
+        bomb_marker = self._marker()
+        self.bombs = ItemPool(c, bomb_marker, lambda: c.create_oval(
+            0, 0, 0, 0, fill="black", tags="game"))
+
+        # 폭발 파편: 색 단계마다 그 색으로 만든 사각형만 재사용해서 색을 바꾸는 itemconfigure 가 없다
+        self.effects = ExplosionEffects()
+        spark_marker = self._marker()
+        self.sparks = [ItemPool(c, spark_marker, lambda color=color: c.create_rectangle(
+            0, 0, 0, 0, fill=color, outline="", tags="game")) for color in PARTICLE_COLORS]
+
+        c.create_rectangle(100, 20, 700, 35, fill="gray", tags=fixed)
+        self.hp_bar = c.create_rectangle(100, 20, 700, 35, fill="red", tags=fixed)
+        self.wave_text = c.create_text(100, 60, text="", font=("Times", 15, "bold"), anchor="w", fill="black", tags="game")
+        self.bomb_text = c.create_text(600, 60, text="", font=("Times", 15, "bold"), anchor="w", fill="black", tags=fixed)
+        self.ammo_text = c.create_text(600, 85, text="", font=("Times", 15, "bold"), anchor="w", fill="black", tags=fixed)
+        self.status_text = c.create_text(400, 130, text="", font=("Times", 25, "bold"), fill="red", tags="game")
+
+        self.pools = (self.obstacles, self.wave_monsters, self.bullets, self.bombs, *self.sparks)
+        c.itemconfigure("game", state=HIDDEN)
+
+    def _marker(self):
+        return self.canvas.create_line(0, 0, 0, 0, state=HIDDEN)
+
+    def _coords(self, item, *xy):
+        if self.last.get(item) != xy:
+            self.last[item] = xy
+            self.canvas.coords(item, *xy)
+
+    def _config(self, item, key, value):
+        k = (item, key)
+        if self.last.get(k) != value:
+            self.last[k] = value
+            self.canvas.itemconfigure(item, **{key: value})
+
+    def set_quality(self, level):
+        self.parallax = level < Q_STATIC_BG
+        width = 1 if level >= Q_SIMPLE_BULLETS else 3
+        if width != self.bullet_width:
+            self.bullet_width = width
+            for item in self.bullets.items:
+                self.canvas.itemconfigure(item, width=width)
+        self.hud_every = PACE_HUD_EVERY if level >= Q_THIN_HUD else 1
+        self.hud_count = 0
+
+    def hide(self):
+        if not self.shown:
+            return
+        self.shown = False
+        self.canvas.itemconfigure("game", state=HIDDEN)
+        for pool in self.pools:
+            pool.reset()
+        self.effects.clear()
+        self.last.clear()
+        self.hud_count = 0
+
+    def draw(self, g, alpha=1.0, status=None):
+        # alpha: 직전 틱(0)과 현재 틱(1) 사이의 보간 비율, status: 화면 가운데에 띄울 글 (일시정지/되감기)
+        if not self.shown:
+            self.shown = True
+            self.canvas.itemconfigure("game_fixed", state=NORMAL)
+
+        # HUD 글자는 hud_every 프레임마다 한 번만 고친다
+        hud = self.hud_count == 0
+        self.hud_count = (self.hud_count + 1) % self.hud_every
+
+        back = 1.0 - alpha
+        # 시뮬레이션은 월드 좌표만 다루고 카메라 오프셋은 여기서 한 번 뺀다
+        cam = g.scroll_x - back * (g.scroll_x - g.prev_scroll_x)
+
+        if self.ingame_bg_image and self.parallax:
+            shift = (cam * BG_SPEED_FACTOR) % SCREEN_WIDTH
+            self._coords(self.bg[0], -shift, 0)
+            self._coords(self.bg[1], -shift + SCREEN_WIDTH, 0)
+
+        pool = self.obstacles
+        pool.begin()
+        for x, h, w in g.obstacles.query(cam, cam + SCREEN_WIDTH):
+            x -= cam
+            self.canvas.coords(pool.take(), x, GROUND_Y - h, x + w, GROUND_Y)
+        pool.end()
+
+        if g.mode == "wave":
+            self._draw_wave(g, back, cam, hud)
+        else:
+            self._draw_monster(g, back, cam, hud)
+
+        p_x = g.p_x - back * (g.p_x - g.prev_p_x) - cam
+        p_y = g.p_y - back * (g.p_y - g.prev_p_y)
+        if self.player_img_right and self.player_img_left:
+            self._coords(self.player, p_x, p_y - 20)
+            img = self.player_img_right if g.facing == 'right' else self.player_img_left
+            self._config(self.player, "image", img)
+        else:
+            self._coords(self.player, p_x - 20, p_y - 40, p_x + 20, p_y)
+
+        pool = self.bullets
+        pool.begin()
+        bullets = g.bullets
+        n = bullets.n
+        if n:
+            dx = bullets.dx[:n]
+            dy = bullets.dy[:n]
+            bullet_back = back * BULLET_SPEED
+            x0 = bullets.x[:n] - dx * bullet_back - cam
+            y0 = bullets.y[:n] - dy * bullet_back
+            coords = self.canvas.coords
+            for line in zip(x0.tolist(), y0.tolist(), (x0 + dx * 10).tolist(), (y0 + dy * 10).tolist()):
+                coords(pool.take(), *line)
+        pool.end()
+
+        pool = self.bombs
+        pool.begin()
+        bombs = g.bombs
+        n = bombs.n
+        if n:
+            flying = ~bombs.exploded[:n]
+            bomb_back = back * BOMB_SPEED
+            xs = (bombs.x[:n] - bombs.dx[:n] * bomb_back - cam)[flying].tolist()
+            ys = (bombs.y[:n] - bombs.dy[:n] * bomb_back)[flying].tolist()
+            for x, y in zip(xs, ys):
+                self.canvas.coords(pool.take(), x - 10, y - 10, x + 10, y + 10)
+        pool.end()
+
+        self.effects.update(g)
+        for pool in self.sparks:
+            pool.begin()
+        coords = self.canvas.coords
+        for k, xs, ys in self.effects.groups(cam):
+            pool = self.sparks[k]
+            r = PARTICLE_SIZES[k]
+            for x, y in zip(xs, ys):
+                coords(pool.take(), x - r, y - r, x + r, y + r)
+        for pool in self.sparks:
+            pool.end()
+
+        if hud:
+            self._config(self.bomb_text, "text", f"폭탄: {g.bomb_count} / {BOMB_MAX_COUNT}")
+            if g.is_reloading:
+                self._config(self.ammo_text, "text", "재장전 중...")
+                self._config(self.ammo_text, "fill", "red")
+            else:
+                self._config(self.ammo_text, "text", f"총알: {g.ammo} / {PLAYER_MAX_AMMO}")
+                self._config(self.ammo_text, "fill", "black")
+
+        if status:
+            self._config(self.status_text, "text", status)
+        self._config(self.status_text, "state", NORMAL if status else HIDDEN)
+
+    def _draw_monster(self, g, back, cam, hud):
+        self._config(self.monster, "state", NORMAL)
+        self._config(self.monster_hp, "state", NORMAL)
+        self._config(self.wave_text, "state", HIDDEN)
+
+        m_x = g.m_x - back * (g.m_x - g.prev_m_x) - cam
+        m_y = g.m_y - back * (g.m_y - g.prev_m_y)
+        if self.monster_img:
+            self._coords(self.monster, m_x, m_y)
+        else:
+            self._coords(self.monster, m_x - 60, m_y - 60, m_x + 60, m_y + 60)
+            self._config(self.monster, "fill", "gray" if g.m_stunned else "red")
+
+        self._coords(self.monster_hp, m_x, m_y - 80)
+        if hud:
+            self._config(self.monster_hp, "text", f"HP: {g.m_hp}")
+        if g.m_stunned:
+            self._coords(self.monster_stun, m_x, m_y)
+        self._config(self.monster_stun, "state", NORMAL if g.m_stunned else HIDDEN)
+
+        if hud:
+            hp_percent = max(0, g.m_hp / g.balance.monster_max_hp)
+            self._coords(self.hp_bar, 100, 20, 100 + 600 * hp_percent, 35)
+
+    def _draw_wave(self, g, back, cam, hud):
+        # 웨이브 모드: 괴물은 풀에서 꺼내 쓰고 체력 막대는 이번 웨이브의 남은 괴물 비율을 보여 준다
+        self._config(self.monster, "state", HIDDEN)
+        self._config(self.monster_hp, "state", HIDDEN)
+        self._config(self.monster_stun, "state", HIDDEN)
+        self._config(self.wave_text, "state", NORMAL)
+
+        pool = self.wave_monsters
+        pool.begin()
+        m = g.monsters
+        n = m.n
+        if n:
+            xs = m.x[:n] - back * (m.x[:n] - m.px[:n]) - cam
+            ys = m.y[:n] - back * (m.y[:n] - m.py[:n])
+            visible = (xs > -WAVE_MONSTER_RADIUS) & (xs < SCREEN_WIDTH + WAVE_MONSTER_RADIUS)
+            coords = self.canvas.coords
+            r = WAVE_MONSTER_RADIUS
+            if self.wave_monster_img:
+                for x, y in zip(xs[visible].tolist(), ys[visible].tolist()):
+                    coords(pool.take(), x, y)
+            else:
+                for x, y in zip(xs[visible].tolist(), ys[visible].tolist()):
+                    coords(pool.take(), x - r, y - r, x + r, y + r)
+        pool.end()
+
+        if hud:
+            self._config(self.wave_text, "text", f"웨이브 {g.wave} / {WAVE_COUNT}   남은 괴물 {n}")
+            left = n / g.wave_size if g.wave_size else 0
+            self._coords(self.hp_bar, 100, 20, 100 + 600 * left, 35)
+
+
+class ProfilerOverlay:
+    # F3 로 켜고 끄는 프레임 프로파일러 표시
+    # 글자를 바꾸는 것도 비용이라 REFRESH_FRAMES 프레임마다 한 번만 고친다
+    REFRESH_FRAMES = 15
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.enabled = False
+        self.playing = False
+        self.visible = False
+        self.countdown = 0
+        self.box = canvas.create_rectangle(5, 45, 320, 180, fill="black", outline="", state=HIDDEN, tags="profiler")
+        self.text = canvas.create_text(12, 50, text="", anchor=NW, fill="#00ff00", font=("Courier", 10),
+                                       state=HIDDEN, tags="profiler")
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.sync(self.playing)
+
+    def sync(self, playing):
+        # 게임 화면일 때만 보인다
+        self.playing = playing
+        visible = self.enabled and playing
+        if visible == self.visible:
+            return
+        self.visible = visible
+        self.canvas.itemconfigure("profiler", state=NORMAL if visible else HIDDEN)
+        if visible:
+            self.canvas.tag_raise("profiler")
+            self.countdown = 0
+
+    def update(self, profiler, voices=None, pacer=None):
+        if not self.visible:
+            return
+        self.countdown -= 1
+        if self.countdown > 0:
+            return
+        self.countdown = self.REFRESH_FRAMES
+
+        lines = summary_lines(profiler.summary(), voices, pacer)
+        if lines:
+            self.canvas.itemconfigure(self.text, text="\n".join(lines))
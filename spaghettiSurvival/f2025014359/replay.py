@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# 입력 기록 / 창 없이 최대 속도로 다시 돌리기
+#   python replay.py run.ssr [run2.ssr ...]
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+
+from settings import *
+from assets import AssetCache
+from masks import load_sprite_masks
+from simulation import Simulation, InputState
+
+MAGIC = b"SSRP"
+VERSION = 3     # 2: 장애물이 시드별 청크로 바뀜, 3: 마스크 판정 여부를 기록 (이전 버전은 다시 돌리면 어긋난다)
+# 매직, 버전, 플래그, 틱레이트, 시드, 틱 수, 마지막 상태 해시(sha1 40자)
+HEADER = struct.Struct("<4sBBHQI40s")
+# 한 틱 입력: 버튼 비트, 마우스 x, 마우스 y
+TICK_INPUT = struct.Struct("<Bhh")
+
+BTN_LEFT = 1
+BTN_RIGHT = 2
+BTN_JUMP = 4
+BTN_RELOAD = 8
+BTN_FIRE = 16
+BTN_BOMB = 32
+
+FLAG_MASKS = 1      # 스프라이트 마스크로 판정한 판
+
+
+def pack_input(inp):
+    bits = ((BTN_LEFT if inp.left else 0) | (BTN_RIGHT if inp.right else 0) |
+            (BTN_JUMP if inp.jump else 0) | (BTN_RELOAD if inp.reload else 0) |
+            (BTN_FIRE if inp.fire else 0) | (BTN_BOMB if inp.bomb else 0))
+    return TICK_INPUT.pack(bits, int(inp.mouse_x), int(inp.mouse_y))
+
+
+def unpack_input(bits, mouse_x, mouse_y):
+    return InputState(
+        left=bool(bits & BTN_LEFT),
+        right=bool(bits & BTN_RIGHT),
+        jump=bool(bits & BTN_JUMP),
+        reload=bool(bits & BTN_RELOAD),
+        fire=bool(bits & BTN_FIRE),
+        bomb=bool(bits & BTN_BOMB),
+        mouse_x=mouse_x,
+        mouse_y=mouse_y,
+    )
+
+
+class InputRecorder:
+    # 시뮬레이션에 들어간 입력을 틱마다 5바이트로 쌓는다
+    def __init__(self, seed, masks=False):
+        self.seed = seed
+        self.masks = masks
+        self.ticks = 0
+        self.data = bytearray()
+
+    def record(self, inp):
+        # 마우스 좌표는 정수로 저장되므로 기록하는 쪽도 같은 값을 쓰게 돌려준다
+        packed = pack_input(inp)
+        self.data += packed
+        self.ticks += 1
+        return unpack_input(*TICK_INPUT.unpack(packed))
+
+    def save(self, path, final_digest):
+        with open(path, "wb") as f:
+            flags = FLAG_MASKS if self.masks else 0
+            f.write(HEADER.pack(MAGIC, VERSION, flags, FPS, self.seed, self.ticks, final_digest.encode()))
+            f.write(zlib.compress(bytes(self.data)))
+
+
+class Recording:
+    def __init__(self, seed, ticks, digest, data, tick_rate=FPS, masks=False):
+        self.seed = seed
+        self.ticks = ticks
+        self.digest = digest
+        self.data = data
+        self.tick_rate = tick_rate
+        self.masks = masks
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        # 잘리거나 깨진 파일은 모두 ValueError 로 알린다
+        if len(raw) < HEADER.size:
+            raise ValueError(f"{path}: 파일이 너무 짧습니다 (헤더 {HEADER.size}바이트)")
+        magic, version, flags, tick_rate, seed, ticks, digest = HEADER.unpack_from(raw)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: 리플레이 파일이 아닙니다")
+        if version != VERSION:
+            raise ValueError(f"{path}: 지원하지 않는 리플레이 버전입니다 ({version}, 현재 {VERSION})")
+        try:
+            data = zlib.decompress(raw[HEADER.size:])
+        except zlib.error as e:
+            raise ValueError(f"{path}: 입력 데이터가 깨져 있습니다 ({e})")
+        if len(data) != ticks * TICK_INPUT.size:
+            raise ValueError(f"{path}: 입력 길이가 맞지 않습니다")
+        return cls(seed, ticks, digest.decode(), data, tick_rate, bool(flags & FLAG_MASKS))
+
+    def inputs(self):
+        for fields in TICK_INPUT.iter_unpack(self.data):
+            yield unpack_input(*fields)
+
+
+def replay(recording, sim=None):
+    # 기록된 입력을 틱 단위로 그대로 다시 넣는다 (창, 사운드, 대기 없음)
+    if sim is None:
+        masks = None
+        if recording.masks:
+            masks = load_sprite_masks(AssetCache(os.path.dirname(os.path.abspath(__file__))))
+            if masks is None:
+                raise ValueError("스프라이트 이미지가 없어 마스크 판정을 다시 만들 수 없습니다")
+        sim = Simulation(recording.seed, masks=masks)
+    else:
+        sim.reset(recording.seed)
+    dt = 1.0 / recording.tick_rate
+    for inp in recording.inputs():
+        sim.step(inp, dt)
+    return sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="기록된 판을 창 없이 다시 실행")
+    parser.add_argument("files", nargs="+", help="--record 로 저장한 파일")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.files:
+        # 파일 하나가 잘못돼도 나머지는 계속 돌린다
+        try:
+            rec = Recording.load(path)
+            t = time.perf_counter()
+            sim = replay(rec)
+            elapsed = time.perf_counter() - t
+        except (OSError, ValueError) as e:
+            # 메시지에 파일 이름이 이미 들어 있다
+            print(f"실패: {e}")
+            failed += 1
+            continue
+        ok = sim.state_digest() == rec.digest
+        failed += not ok
+        speed = rec.ticks / max(elapsed, 1e-9)
+        print(f"{path}: {rec.ticks} 틱, {sim.state}, {elapsed * 1000:.1f} ms "
+              f"({speed:.0f} 틱/s, 실시간의 {speed / rec.tick_rate:.0f}배) {'일치' if ok else '불일치'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# 되감기용 스냅샷 링 버퍼
+# Simulation.save_state() 로 만든 틱별 스냅샷을 직전 틱과의 XOR 델타로 바꿔 zlib 으로 줄이고
+# 미리 잡아 둔 바이트 영역(arena)에 차례로 쓴다. 자리가 모자라면 가장 오래된 기록부터 덮어쓴다
+# REWIND_KEYFRAME_EVERY 틱마다 한 번은 델타 없이 전체를 넣어서, 되감을 때 가까운 키프레임부터 풀면 된다
+import zlib
+from collections import deque
+
+import numpy as np
+
+from settings import *
+
+
+def xor_delta(base, data):
+    # data 와 길이가 같은 결과를 돌려준다. xor_delta(base, xor_delta(base, data)) == data
+    out = np.frombuffer(data, np.uint8).copy()
+    k = min(len(out), len(base))
+    out[:k] ^= np.frombuffer(base, np.uint8, k)
+    return out.tobytes()
+
+
+class SnapshotRing:
+    def __init__(self, seconds=REWIND_SECONDS, buffer_bytes=REWIND_BUFFER_BYTES,
+                 keyframe_every=REWIND_KEYFRAME_EVERY):
+        self.max_records = int(seconds * FPS)
+        self.arena = bytearray(buffer_bytes)
+        self.view = memoryview(self.arena)
+        self.keyframe_every = keyframe_every
+        self.clear()
+
+    def __len__(self):
+        return len(self.records)
+
+    def clear(self):
+        self.records = deque()     # (arena 위치, 길이, 키프레임 여부), 오래된 것부터
+        self.write_pos = 0
+        self.last = None           # 가장 최근 스냅샷 원본 (다음 델타의 기준)
+        self.since_key = 0
+        self.segment = None        # 되감는 동안 풀어 둔 (키프레임 번호, [원본...])
+
+    def push(self, snapshot):
+        self.segment = None
+        # since_key: 마지막 키프레임 뒤에 쌓인 델타 수. 키프레임을 포함해 keyframe_every 장마다 한 번 키프레임
+        key = self.last is None or self.since_key >= self.keyframe_every - 1
+        packed = zlib.compress(snapshot if key else xor_delta(self.last, snapshot), 1)
+        if len(packed) > len(self.arena):
+            # 한 장도 안 들어가면 기록을 이어 갈 수 없다
+            self.clear()
+            return
+        if not self._store(packed, key):
+            # 델타의 기준 키프레임까지 덮어썼으면 전체 스냅샷으로 다시 넣는다
+            key = True
+            self._store(zlib.compress(snapshot, 1), key)
+        self.last = snapshot
+        self.since_key = 0 if key else self.since_key + 1
+
+    def _store(self, packed, key):
+        size = len(packed)
+        records = self.records
+        pos = self.write_pos
+        if pos + size > len(self.arena):
+            # 끝의 남은 자리는 비워 두고 앞에서부터 다시 쓴다. 그 뒤쪽에 남은 기록이 가장 오래된 것이다
+            while records and records[0][0] >= pos:
+                self._drop_oldest()
+            pos = 0
+        while records and (len(records) >= self.max_records or
+                           (records[0][0] < pos + size and records[0][0] + records[0][1] > pos)):
+            self._drop_oldest()
+        if not key and not records:
+            return False
+        self.view[pos:pos + size] = packed
+        records.append((pos, size, key))
+        self.write_pos = pos + size
+        return True
+
+    def _drop_oldest(self):
+        # 키프레임이 빠지면 그 뒤의 델타는 풀 수 없으니 다음 키프레임까지 같이 버린다
+        records = self.records
+        records.popleft()
+        while records and not records[0][2]:
+            records.popleft()
+
+    def _unpack(self, i):
+        pos, size, key = self.records[i]
+        return zlib.decompress(self.view[pos:pos + size]), key
+
+    def rewind(self, steps):
+        # 최근 steps 틱을 버리고 그 직전 스냅샷 원본을 돌려준다 (가장 오래된 한 장은 남긴다)
+        records = self.records
+        if not records:
+            return None
+        for _ in range(min(steps, len(records) - 1)):
+            records.pop()
+        last = len(records) - 1
+
+        segment = self.segment
+        if segment is not None and segment[0] + len(segment[1]) > last >= segment[0]:
+            del segment[1][last - segment[0] + 1:]
+        else:
+            start = last
+            while not records[start][2]:
+                start -= 1
+            data, _ = self._unpack(start)
+            states = [data]
+            for i in range(start + 1, last + 1):
+                data = xor_delta(data, self._unpack(i)[0])
+                states.append(data)
+            segment = self.segment = (start, states)
+
+        self.last = segment[1][-1]
+        self.since_key = last - segment[0]
+        self.write_pos = records[-1][0] + records[-1][1]
+        return self.last
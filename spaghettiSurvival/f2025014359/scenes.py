@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+from tkinter import NW, HIDDEN, NORMAL
+
+from settings import *
+
+HELP_INSTRUCTIONS = [
+    ("이동", "W, A, D"),
+    ("점프", "Space Bar"),
+    ("공격 (총)", "마우스 왼쪽 클릭"),
+    ("특수 공격 (폭탄)", "마우스 오른쪽 클릭 (횟수 제한)"),
+    ("재장전", "S 키"),
+    ("되감기 / 일시정지", "R 키 (누르고 있기) / P 키"),
+]
+
+# 상태 -> 레이어 태그 (GAME_OVER / CLEAR 는 같은 화면을 내용만 바꿔 쓴다)
+LAYER_OF_STATE = {
+    "MENU": "scene_menu",
+    "HELP": "scene_help",
+    "RANK": "scene_rank",
+    "GAME_OVER": "scene_end",
+    "CLEAR": "scene_end",
+}
+
+
+class SceneLayers:
+    # 메뉴/도움말/기록/종료 화면을 한 번만 만들어 두고 태그 단위로 보이기/숨기기만 한다
+    # 바뀌는 부분(메뉴 커서, 기록 목록, 종료 문구)만 itemconfig 로 고친다
+    def __init__(self, canvas, menu_bg_image, menu_options):
+        self.canvas = canvas
+        self.current = None
+
+        self._build_menu(menu_bg_image, menu_options)
+        self._build_help()
+        self._build_rank()
+        self._build_end()
+
+        for tag in set(LAYER_OF_STATE.values()):
+            canvas.itemconfigure(tag, state=HIDDEN)
+
+    def _build_menu(self, menu_bg_image, menu_options):
+        c = self.canvas
+        tag = "scene_menu"
+        if menu_bg_image:
+            c.create_image(0, 0, image=menu_bg_image, anchor=NW, tags=tag)
+        else:
+            c.create_rectangle(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, fill="#f0f0f0", tags=tag)
+
+        self.menu_options = menu_options
+        self.menu_items = []
+        self.menu_index = None
+        start_y = 180
+        for i, option in enumerate(menu_options):
+            x_pos = 100
+            y_pos = start_y + i * 60
+            shadow = c.create_text(x_pos + 2, y_pos + 2, text=option, font=("Times", 30, "bold"), fill="black", anchor="w", tags=tag)
+            text = c.create_text(x_pos, y_pos, text=option, font=("Times", 30, "bold"), fill="white", anchor="w", tags=tag)
+            self.menu_items.append((shadow, text))
+
+    def _build_help(self):
+        c = self.canvas
+        tag = "scene_help"
+        c.create_rectangle(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, fill="#FFE4B5", tags=tag)
+        c.create_text(400, 60, text="< 게임 조작법 >", font=("Times", 35, "bold"), fill="black", tags=tag)
+
+        start_y = 150
+        for i, (action, key) in enumerate(HELP_INSTRUCTIONS):
+            c.create_text(250, start_y + i*45, text=action, font=("Times", 20, "bold"), anchor="e", fill="#8B4513", tags=tag)
+            c.create_text(280, start_y + i*45, text=":", font=("Times", 20, "bold"), anchor="center", tags=tag)
+            c.create_text(310, start_y + i*45, text=key, font=("Times", 20), anchor="w", fill="black", tags=tag)
+
+        c.create_text(400, 420, text="Press ESC to return", font=("Times", 15), fill="gray", tags=tag)
+
+    def _build_rank(self):
+        c = self.canvas
+        tag = "scene_rank"
+        c.create_rectangle(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, fill="#eee", tags=tag)
+        c.create_text(400, 50, text="순 위", font=("Times", 30, "bold"), tags=tag)
+        self.rank_items = [c.create_text(400, 120 + i*30, text="", font=("Times", 15), tags=tag) for i in range(10)]
+        self.rank_version = None
+        c.create_text(400, 450, text="Press ESC to return", fill="gray", tags=tag)
+
+    def _build_end(self):
+        c = self.canvas
+        tag = "scene_end"
+        self.end_bg = c.create_rectangle(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, fill="black", tags=tag)
+        self.end_msg = c.create_text(400, 200, text="", font=("Times", 50, "bold"), fill="white", tags=tag)
+        self.end_sub = c.create_text(400, 300, text="", font=("Times", 20), fill="white", tags=tag)
+        c.create_text(400, 400, text="Press SPACE to Menu", fill="white", tags=tag)
+
+    def show(self, state):
+        layer = LAYER_OF_STATE.get(state)
+        if layer == self.current:
+            return
+        if self.current:
+            self.canvas.itemconfigure(self.current, state=HIDDEN)
+        if layer:
+            self.canvas.itemconfigure(layer, state=NORMAL)
+            self.canvas.tag_raise(layer)
+        self.current = layer
+
+    def set_menu_index(self, index):
+        if index == self.menu_index:
+            return
+        for i in (self.menu_index, index):
+            if i is None:
+                continue
+            selected = i == index
+            text = ("▶ " if selected else "") + self.menu_options[i]
+            shadow, item = self.menu_items[i]
+            self.canvas.itemconfigure(shadow, text=text)
+            self.canvas.itemconfigure(item, text=text, fill="red" if selected else "white")
+        self.menu_index = index
+
+    def set_ranking(self, version, records):
+        if version == self.rank_version:
+            return
+        for i, item in enumerate(self.rank_items):
+            text = f"{i+1}. {records[i]}" if i < len(records) else ""
+            self.canvas.itemconfigure(item, text=text)
+        self.rank_version = version
+
+    def set_end(self, state, end_time_str):
+        if state == "GAME_OVER":
+            self.canvas.itemconfigure(self.end_bg, fill="black")
+            self.canvas.itemconfigure(self.end_msg, text="GAME OVER")
+            self.canvas.itemconfigure(self.end_sub, text="스파게티에게 잡혔습니다.")
+        else:
+            self.canvas.itemconfigure(self.end_bg, fill="#87CEEB")
+            self.canvas.itemconfigure(self.end_msg, text="CLEAR!")
+            self.canvas.itemconfigure(self.end_sub, text=f"기록: {end_time_str}")
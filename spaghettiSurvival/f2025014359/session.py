@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+# Tk(Game) 와 pygame(PygameGame) 이 같이 쓰는 판 진행 로직
+# 메뉴 상태 전환, 틱 루프(되감기/일시정지), 입력 기록, 이벤트 -> 소리/화면 전환, 클리어 기록을 여기서 한다
+# 하위 클래스는 창과 그리기/입력만 맡는다:
+#   self.renderer (set_quality) 를 만들고
+#   poll_input() -> InputState (폭탄 제외), rewind_held(), draw_game(status), present(), update_scene() 를 채운다
+import os
+import random
+import time
+
+from settings import *
+from timestep import FixedTimestep, FramePacer
+from ranking import RankingStore, format_time
+from audio import SoundBank, VOICE_LIMITS
+from perf import FrameProfiler, P_INPUT, P_RENDER, P_PRESENT, P_SNAPSHOT
+from replay import InputRecorder
+from rewind import SnapshotRing
+from wave import WaveSimulation
+from simulation import Simulation, EVT_SHOT, EVT_RELOAD, EVT_BOMB, EVT_GAME_OVER, EVT_CLEAR
+
+MENU_OPTIONS = ["시작", "도움말", "기록", "종료"]
+
+
+def start_sounds(base_path):
+    # 효과음/배경음 로딩은 백그라운드 스레드에서 바로 시작한다
+    sounds = SoundBank(base_path,
+                       {"gun": "gun.mp3", "reload": "reload.mp3", "bomb": "bomb.mp3"},
+                       music="bgm.mp3", limits=VOICE_LIMITS)
+    sounds.start()
+    return sounds
+
+
+class GameSession:
+    def __init__(self, base_path, sounds, masks=None, record_path=None, mode="classic"):
+        self.base_path = base_path
+        self.sounds = sounds
+        self.masks = masks
+        self.record_path = record_path
+        self.mode = mode
+        self.recorder = None
+
+        self.state = "MENU"
+        self.running = True
+        self.menu_options = MENU_OPTIONS
+        self.menu_index = 0
+        self.end_time_str = ""
+        self.ranking = RankingStore(base_path)
+
+        self.profiler = FrameProfiler()
+        sim_class = WaveSimulation if mode == "wave" else Simulation
+        self.sim = sim_class(prefetch=True, masks=masks)
+        self.timestep = FixedTimestep()
+        self.pacer = FramePacer()
+        self.history = SnapshotRing()
+        self.paused = False
+        self.bomb_requested = False
+
+    # 하위 클래스가 채우는 것들
+    def poll_input(self):
+        raise NotImplementedError
+
+    def rewind_held(self):
+        return False
+
+    def draw_game(self, status=None):
+        pass
+
+    def present(self):
+        pass
+
+    def update_scene(self):
+        pass
+
+    def set_state(self, state):
+        self.state = state
+        if state != "PLAY":
+            self.profiler.pause()
+
+    def request_quit(self):
+        self.running = False
+
+    # 메뉴/키 처리
+    def press(self, key):
+        # key 는 프런트엔드가 바꿔 준 이름: up, down, space, return, escape, p, f4 (그 밖은 None)
+        if key == "f4":
+            self.dump_profile()
+
+        if self.state == "PLAY" and key == "p":
+            self.toggle_pause()
+        elif self.state == "MENU":
+            if key == "up":
+                self.menu_index = (self.menu_index - 1) % len(self.menu_options)
+                self.update_scene()
+            elif key == "down":
+                self.menu_index = (self.menu_index + 1) % len(self.menu_options)
+                self.update_scene()
+            elif key in ("space", "return"):
+                self.execute_menu()
+        elif self.state in ("RANK", "HELP") and key == "escape":
+            self.set_state("MENU")
+        elif self.state in ("GAME_OVER", "CLEAR") and key == "space":
+            self.sounds.stop_music()
+            self.set_state("MENU")
+
+    def request_bomb(self):
+        # 우클릭은 눌린 순간만 폭탄 한 번이라 다음 틱 입력까지 들고 있는다
+        if self.state == "PLAY":
+            self.bomb_requested = True
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def execute_menu(self):
+        if self.menu_index == 0:
+            self.start_game()
+        elif self.menu_index == 1:
+            self.set_state("HELP")
+        elif self.menu_index == 2:
+            self.set_state("RANK")
+        elif self.menu_index == 3:
+            self.request_quit()
+
+    def start_game(self):
+        seed = random.randrange(2**32)
+        if self.record_path:
+            self.recorder = InputRecorder(seed, masks=self.masks is not None)
+        self.reset_sim(seed)
+        self.paused = False
+        self.pacer.reset()
+        self.renderer.set_quality(self.pacer.level)
+        self.timestep.reset()
+        self.bomb_requested = False
+        self.sounds.play_music()
+        self.set_state("PLAY")
+
+    def reset_sim(self, seed):
+        self.sim.reset(seed)
+        self.history.clear()
+        self.history.push(self.sim.save_state())
+
+    def dump_profile(self):
+        path = os.path.join(self.base_path, time.strftime("profile_%Y%m%d_%H%M%S.csv"))
+        try:
+            count = self.profiler.dump_csv(path)
+            print(f"프레임 {count}개 -> {path}")
+        except OSError as e:
+            print(f"프로파일 저장 실패: {e}")
+
+    # 판 진행
+    def play_frame(self, frame_dt):
+        # 한 프레임: 틱을 돌리고 필요하면 그린다. 판이 끝났으면 False
+        start_t = time.perf_counter()
+        prof = self.profiler
+        prof.begin_frame()
+        status = self.update_play(frame_dt)
+        if self.state != "PLAY":
+            return False
+        # 부하가 크면 틱은 그대로 돌리고 그리기만 건너뛴다 (멈춤/되감기 화면은 항상 그린다)
+        if status or self.pacer.should_render():
+            self.draw_game(status)
+            prof.lap(P_RENDER)
+            self.present()
+            prof.lap(P_PRESENT)
+        sim = self.sim
+        prof.end_frame(sim.bullets.n, sim.bombs.n, len(sim.obstacles))
+        if self.pacer.record(time.perf_counter() - start_t):
+            self.renderer.set_quality(self.pacer.level)
+        return True
+
+    def read_input(self):
+        inp = self.poll_input()
+        inp.bomb = self.bomb_requested
+        self.bomb_requested = False
+        return inp
+
+    def update_play(self, frame_dt):
+        # 틱을 돌리고 화면에 띄울 상태 문구를 돌려준다 (보통은 None)
+        prof = self.profiler
+        steps = self.timestep.advance(frame_dt)
+        # 입력을 기록하는 중에는 되감으면 리플레이가 맞지 않으므로 되감기를 막는다
+        if not self.recorder and self.rewind_held():
+            # 스냅샷이 링 버퍼보다 커서 기록이 비어 있으면 rewind 는 None 이다 (그대로 둔다)
+            state = self.history.rewind(steps) if steps else None
+            if state is not None:
+                self.sim.load_state(state)
+                self.bomb_requested = False
+                prof.lap(P_SNAPSHOT)
+            return "◀◀ 되감기"
+        if self.paused:
+            return "일시정지 (P)"
+        for _ in range(steps):
+            inp = self.read_input()
+            if self.recorder:
+                inp = self.recorder.record(inp)
+            prof.lap(P_INPUT)
+            events = self.sim.step(inp, TICK)
+            self.handle_events(events)
+            prof.lap(P_INPUT)
+            if self.state != "PLAY":
+                return None
+            self.history.push(self.sim.save_state())
+            prof.lap(P_SNAPSHOT)
+        return None
+
+    def handle_events(self, events):
+        for evt in events:
+            if evt == EVT_SHOT:
+                self.sounds.play("gun")
+            elif evt == EVT_RELOAD:
+                self.sounds.play("reload")
+            elif evt == EVT_BOMB:
+                self.sounds.play("bomb")
+            elif evt == EVT_GAME_OVER:
+                self.finish_recording()
+                self.sounds.stop_music()
+                self.set_state("GAME_OVER")
+            elif evt == EVT_CLEAR:
+                self.game_clear(self.sim.clear_time)
+
+    def game_clear(self, duration):
+        self.finish_recording()
+        self.sounds.stop_music()
+
+        ms = int(duration * 1000)
+        self.end_time_str = format_time(ms)
+        # 순위표는 기본 모드 기록만 남긴다
+        if self.mode == "classic":
+            self.ranking.add(ms)
+        self.set_state("CLEAR")
+
+    def finish_recording(self):
+        if self.recorder:
+            self.recorder.save(self.record_path, self.sim.state_digest())
+            self.recorder = None
+
+    def shutdown(self):
+        self.finish_recording()
+        self.running = False
+        self.sounds.close()
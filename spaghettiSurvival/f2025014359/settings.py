@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# 게임 설정 및 상수
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 480
+FPS = 60
+DELAY = 1000 // FPS
+
+# 물리/속도 관련
+GRAVITY = 0.6
+JUMP_FORCE = -12
+SPEED_FORWARD = 8
+SPEED_BACKWARD = 6
+MONSTER_SPEED = 6
+BULLET_SPEED = 15
+
+# 게임 밸런스
+MONSTER_MAX_HP = 1000
+PLAYER_MAX_AMMO = 50
+BOMB_MAX_COUNT = 3
+BOMB_DAMAGE = 20
+RELOAD_TIME = 3.0
+STUN_TIME = 3.0
+DAMAGE_PER_BULLET = 1
+BOMB_SPEED = 12
+EXPLOSION_RADIUS = 80
+EXPLOSION_DURATION = 0.5
+MONSTER_HIT_RADIUS = 60
+BOMB_RADIUS = 10                    # 폭탄 그림 반지름 (마스크 판정에서 괴물 마스크를 이만큼 부풀린다)
+
+# 투사체 풀 크기
+BULLET_CAPACITY = 4096
+BOMB_CAPACITY = 64
+
+# 레벨 (장애물 배치)
+CHUNK_WIDTH = 800
+LEVEL_START_X = SCREEN_WIDTH + 50   # 첫 청크의 왼쪽 끝 (시작 화면에는 장애물이 없다)
+LEVEL_LOOKAHEAD = 100               # 화면 오른쪽 끝에서 이만큼 앞에 걸친 청크까지 넣어 둔다
+LEVEL_BEHIND = 50                   # 카메라 왼쪽으로 이만큼 지나간 장애물은 버린다
+LEVEL_PREFETCH = 2                  # 배경 스레드로 미리 만들어 둘 청크 수
+OBSTACLE_WIDTH = 30
+OBSTACLE_GAP_MIN = 80
+OBSTACLE_GAP_MAX = 260
+
+# 웨이브 모드 (작은 괴물 여러 마리)
+WAVE_COUNT = 8
+WAVE_FIRST_SIZE = 12
+WAVE_GROWTH = 1.5
+WAVE_BREAK = 3.0
+WAVE_MONSTER_CAPACITY = 512
+WAVE_MONSTER_HP = 2
+WAVE_MONSTER_SIZE = 60
+WAVE_MONSTER_RADIUS = 30
+WAVE_SPEED_MIN = 2.0
+WAVE_SPEED_MAX = 5.0
+WAVE_CATCH_DIST = 50
+SPATIAL_CELL_SIZE = 64
+
+# 폭발 파편 (그리기 전용, 시뮬레이션 상태에는 들어가지 않는다)
+PARTICLE_BUDGET = 192               # 동시에 살아 있는 파편 수 상한 (모든 폭발 합계)
+PARTICLES_PER_BLAST = 64
+PARTICLE_SPEED_MIN = 60.0           # px/s
+PARTICLE_SPEED_MAX = 320.0
+PARTICLE_LIFT = 120.0               # 처음에 위로 더해 주는 속도
+PARTICLE_GRAVITY = 600.0            # px/s^2
+PARTICLE_DRAG = 0.2                 # 1초 뒤에 남는 속도 비율
+PARTICLE_LIFE_MIN = 0.3             # s
+PARTICLE_LIFE_MAX = 0.8
+PARTICLE_COLORS = ("#fff3a0", "#ffb020", "#ff5a1f", "#6b2a14")   # 남은 수명에 따라 차례로 바뀐다
+PARTICLE_SIZES = (4, 3, 3, 2)       # 색 단계별 반 변 길이
+
+# 충돌 마스크 (스프라이트 알파 채널)
+MASK_ALPHA_THRESHOLD = 128          # 알파가 이 이상인 픽셀만 맞는 자리로 본다
+MASK_SAMPLE_STEP = 2.0              # 총알/폭탄 선분을 이 간격(픽셀)으로 찍어 마스크를 본다
+
+# 화면 배치
+GROUND_Y = 400
+BG_SPEED_FACTOR = 0.5
+
+# 게임 루프
+TICK = 1.0 / FPS
+MAX_CATCHUP_STEPS = 5
+MAX_RENDER_FPS = 120
+RENDER_DELAY = 1000 / MAX_RENDER_FPS
+
+# 프레임 페이싱: 프레임 비용이 틱 길이에 가까워지면 렌더링을 건너뛰고 화질을 한 단계씩 낮춘다
+PACE_HIGH_LOAD = 0.9       # 최근 프레임 비용 / 틱 길이가 이보다 크면 한 단계 낮춘다
+PACE_LOW_LOAD = 0.4        # 이보다 작으면 한 단계 올린다 (낮춘 단계가 비용을 절반쯤 줄여도 되돌아가지 않게 간격을 둔다)
+PACE_DEGRADE_FRAMES = 20   # 낮추기 전에 연속으로 넘어야 하는 프레임 수
+PACE_RESTORE_FRAMES = 120  # 올리기 전에 연속으로 여유가 있어야 하는 프레임 수
+PACE_HUD_EVERY = 6         # HUD 를 줄인 단계에서 글자를 고치는 프레임 간격
+
+# 되감기 (R 키를 누르고 있는 동안)
+REWIND_SECONDS = 5
+REWIND_BUFFER_BYTES = 8 << 20      # 스냅샷 링 버퍼 크기 (고정)
+REWIND_KEYFRAME_EVERY = 30         # 이 틱마다 한 번은 델타 대신 전체 스냅샷을 넣는다
+
+
+class BalanceConfig:
+    # 판마다 바꿀 수 있는 밸런스 값 (기본값은 위 상수)
+    # batch.py 가 여러 조합을 만들어 Simulation 에 넘긴다
+    __slots__ = ("monster_speed", "monster_max_hp", "bomb_damage",
+                 "reload_time", "stun_time", "explosion_radius")
+
+    def __init__(self, monster_speed=MONSTER_SPEED, monster_max_hp=MONSTER_MAX_HP,
+                 bomb_damage=BOMB_DAMAGE, reload_time=RELOAD_TIME, stun_time=STUN_TIME,
+                 explosion_radius=EXPLOSION_RADIUS):
+        self.monster_speed = monster_speed
+        self.monster_max_hp = monster_max_hp
+        self.bomb_damage = bomb_damage
+        self.reload_time = reload_time
+        self.stun_time = stun_time
+        self.explosion_radius = explosion_radius
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __repr__(self):
+        return "BalanceConfig(" + ", ".join(f"{k}={v}" for k, v in self.as_dict().items()) + ")"
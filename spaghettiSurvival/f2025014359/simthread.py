@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# 시뮬레이션을 별도 스레드에서 고정 틱으로 돌린다 (python spaghettiSurvival.py --sim-thread)
+# Tk 스레드는 입력을 inputs 큐에 넣고, 가장 최근에 발행된 RenderSnapshot 만 읽어서 그린다
+# 시뮬레이션 스레드는 이벤트(소리, 판 끝)를 events 큐에 넣는다
+# deque 의 append / popleft 는 GIL 아래에서 원자적이라 두 큐 모두 락 없이 쓴다
+import threading
+import time
+from collections import deque
+
+from settings import *
+from obstacles import ObstacleTrack
+from rewind import SnapshotRing
+from simulation import InputState
+
+# RenderSnapshot 이 그대로 옮겨 두는 값 (렌더러가 g.xxx 로 읽는 것들)
+SNAPSHOT_FIELDS = (
+    "mode", "balance", "time", "scroll_x", "prev_scroll_x",
+    "p_x", "p_y", "prev_p_x", "prev_p_y", "facing",
+    "m_x", "m_y", "prev_m_x", "prev_m_y", "m_hp", "m_stunned",
+    "ammo", "bomb_count", "is_reloading",
+)
+
+
+class PoolView:
+    # 풀에서 살아 있는 [0, n) 만 복사한 읽기 전용 사본
+    def __init__(self, pool, names):
+        n = pool.n
+        self.n = n
+        for name in names:
+            setattr(self, name, getattr(pool, name)[:n].copy())
+
+
+class RenderSnapshot:
+    # 한 틱이 끝난 순간의 화면에 필요한 값. 발행한 뒤에는 어느 스레드도 고치지 않는다
+    def __init__(self, sim, status=None):
+        for name in SNAPSHOT_FIELDS:
+            setattr(self, name, getattr(sim, name))
+        self.status = status
+        self.published = time.perf_counter()
+        self.bullets = PoolView(sim.bullets, ("x", "y", "dx", "dy"))
+        self.bombs = PoolView(sim.bombs, ("x", "y", "dx", "dy", "exploded", "explode_time"))
+        track = sim.obstacles
+        self.obstacles = ObstacleTrack()
+        self.obstacles.restore(track.xs[track.head:], track.hs[track.head:], track.ws[track.head:])
+        if sim.mode == "wave":
+            self.monsters = PoolView(sim.monsters, ("x", "y", "px", "py"))
+            self.wave = sim.wave
+            self.wave_size = sim.wave_size
+
+    def alpha(self, now):
+        # 다음 틱이 나올 때까지 직전 틱 -> 이 틱 사이를 보간한다 (멈춤/되감기 중에는 보간하지 않는다)
+        if self.status:
+            return 1.0
+        return min(1.0, (now - self.published) / TICK)
+
+
+class SimThread:
+    # 판 시작/일시정지도 큐로 보내서 Simulation 은 언제나 이 스레드만 건드린다
+    # 판이 끝나면 틱을 멈추므로 그 뒤에는 Tk 스레드가 sim 을 읽어도 된다 (기록 저장, 클리어 시간)
+    def __init__(self, sim):
+        self.sim = sim
+        self.inputs = deque()
+        self.events = deque()
+        self.latest = None          # 가장 최근 RenderSnapshot. 참조를 한 번에 바꿔 끼워서 발행한다
+        self.history = SnapshotRing()
+        self.recorder = None
+        self.keys = set()
+        self.mouse_x = 0
+        self.mouse_y = 0
+        self.buttons = {'left': False, 'right': False}
+        self.bomb_requested = False
+        self.paused = False
+        self.playing = False
+        self.ticks = 0
+        self.dropped = 0
+        self.alive = True
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self.thread.start()
+
+    # Tk 스레드에서 부르는 것들
+    def post(self, *item):
+        self.inputs.append(item)
+        self.wake.set()
+
+    def start_game(self, seed, recorder=None):
+        self.latest = None
+        self.post("start", seed, recorder)
+
+    def stop(self):
+        self.alive = False
+        self.wake.set()
+        self.thread.join(1.0)
+
+    # 여기부터는 시뮬레이션 스레드
+    def _drain(self):
+        inputs = self.inputs
+        while inputs:
+            item = inputs.popleft()
+            kind = item[0]
+            if kind == "key":
+                if item[2]:
+                    self.keys.add(item[1])
+                else:
+                    self.keys.discard(item[1])
+            elif kind == "mouse":
+                self.mouse_x, self.mouse_y = item[1], item[2]
+            elif kind == "button":
+                self.buttons[item[1]] = item[2]
+                if item[1] == 'right' and item[2]:
+                    self.bomb_requested = True
+            elif kind == "pause":
+                self.paused = not self.paused
+            elif kind == "start":
+                self._start(item[1], item[2])
+
+    def _start(self, seed, recorder):
+        self.sim.reset(seed)
+        self.recorder = recorder
+        self.history.clear()
+        self.history.push(self.sim.save_state())
+        self.bomb_requested = False
+        self.paused = False
+        self.playing = True
+        self.latest = RenderSnapshot(self.sim)
+
+    def _read_input(self):
+        keys = self.keys
+        inp = InputState(
+            left='a' in keys or 'A' in keys,
+            right='d' in keys or 'D' in keys,
+            jump='w' in keys or 'W' in keys or 'space' in keys,
+            reload='s' in keys or 'S' in keys,
+            fire=self.buttons['left'],
+            bomb=self.bomb_requested,
+            mouse_x=self.mouse_x,
+            mouse_y=self.mouse_y,
+        )
+        self.bomb_requested = False
+        return inp
+
+    def _tick(self):
+        sim = self.sim
+        status = None
+        # 입력을 기록하는 중에는 되감으면 리플레이가 맞지 않으므로 되감기를 막는다
+        if not self.recorder and ('r' in self.keys or 'R' in self.keys):
+            state = self.history.rewind(1)
+            if state is not None:
+                sim.load_state(state)
+            self.bomb_requested = False
+            status = "◀◀ 되감기"
+        elif self.paused:
+            status = "일시정지 (P)"
+        else:
+            inp = self._read_input()
+            if self.recorder:
+                inp = self.recorder.record(inp)
+            events = sim.step(inp, TICK)
+            self.ticks += 1
+            if sim.state == "PLAY":
+                self.history.push(sim.save_state())
+            else:
+                self.playing = False
+            self.events.extend(events)
+        self.latest = RenderSnapshot(sim, status)
+
+    def _run(self):
+        next_t = time.perf_counter()
+        while self.alive:
+            self._drain()
+            if not self.playing:
+                self.wake.wait(0.1)
+                self.wake.clear()
+                next_t = time.perf_counter()
+                continue
+
+            now = time.perf_counter()
+            if now < next_t:
+                time.sleep(next_t - now)
+                continue
+            # 너무 밀리면 (창을 끌고 있었거나 해서) 따라잡지 않고 버린다
+            behind = int((now - next_t) / TICK)
+            if behind > MAX_CATCHUP_STEPS:
+                self.dropped += behind
+                next_t = now
+            self._tick()
+            next_t += TICK
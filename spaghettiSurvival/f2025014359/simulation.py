@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+# Tk / pygame 없이 돌아가는 게임 로직
+import hashlib
+import marshal
+import math
+import random
+import struct
+
+import numpy as np
+
+from settings import *
+from projectiles import ProjectilePool, BombPool
+from obstacles import ObstacleTrack
+from level import LevelStream, background_worker
+from perf import P_PHYSICS, P_OBSTACLES, P_BULLETS, P_BOMBS
+
+# step() 이 돌려주는 이벤트
+EVT_SHOT = "shot"
+EVT_RELOAD = "reload"
+EVT_BOMB = "bomb"
+EVT_GAME_OVER = "game_over"
+EVT_CLEAR = "clear"
+
+
+class InputState:
+    # 한 틱 동안의 입력 스냅샷 (마우스 좌표는 화면 기준)
+    __slots__ = ("left", "right", "jump", "reload", "fire", "bomb", "mouse_x", "mouse_y")
+
+    def __init__(self, left=False, right=False, jump=False, reload=False,
+                 fire=False, bomb=False, mouse_x=0, mouse_y=0):
+        self.left = left
+        self.right = right
+        self.jump = jump
+        self.reload = reload
+        self.fire = fire
+        self.bomb = bomb
+        self.mouse_x = mouse_x
+        self.mouse_y = mouse_y
+
+
+class Simulation:
+    # 물리 상수는 틱 단위로 적용되고 dt 는 재장전/기절/폭발 같은 타이머에만 쓰인다
+    mode = "classic"
+
+    def __init__(self, seed=None, balance=None, prefetch=False, masks=None):
+        # prefetch: 다음 청크를 배경 스레드에서 미리 만든다 (창을 띄우는 게임용)
+        # masks: SpriteMasks 를 주면 괴물과의 판정을 스프라이트 픽셀 단위로 한다 (없으면 원/거리 판정)
+        self.seed = seed
+        self.balance = balance or BalanceConfig()
+        self.masks = masks
+        self.bullets = ProjectilePool(BULLET_CAPACITY, BULLET_SPEED)
+        self.bombs = BombPool(BOMB_CAPACITY, BOMB_SPEED)
+        self.obstacles = ObstacleTrack()
+        self.level = LevelStream(self.obstacles, background_worker() if prefetch else None)
+        # FrameProfiler 를 넣으면 step() 안의 단계별 시간을 잰다
+        self.profiler = None
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        self.rng = random.Random(self.seed)
+        self.time = 0.0
+        self.state = "PLAY"
+        self.clear_time = 0
+
+        self.p_x = 400
+        self.p_y = 350
+        self.p_vx = 0
+        self.p_vy = 0
+        self.on_ground = False
+        self.facing = "right"
+
+        self.ammo = PLAYER_MAX_AMMO
+        self.bomb_count = BOMB_MAX_COUNT
+        self.is_reloading = False
+        self.reload_start_time = 0
+        self.last_shot_time = 0
+
+        self.m_x = 100
+        self.m_y = 320
+        self.m_hp = self.balance.monster_max_hp
+        self.m_stunned = False
+        self.m_stun_end_time = 0
+
+        self.scroll_x = 0
+        self.save_prev()
+
+        self.bullets.clear()
+        self.bombs.clear()
+        self.obstacles.clear()
+        self.level.reset(self.rng.getrandbits(32))
+        self.level.advance(self.scroll_x)
+
+    def step(self, inp, dt):
+        events = []
+        if self.state != "PLAY":
+            return events
+
+        prof = self.profiler
+        self.time += dt
+        current_time = self.time
+        self.save_prev()
+
+        if inp.bomb:
+            self.use_bomb()
+
+        # 플레이어와 괴물, 장애물, 투사체는 모두 월드 좌표를 쓰고
+        # scroll_x 는 화면 왼쪽 끝의 월드 x (카메라) 이다
+        if inp.mouse_x + self.scroll_x < self.p_x:
+            self.facing = 'left'
+        else:
+            self.facing = 'right'
+
+        move_x = 0
+        if inp.left: move_x -= 1
+        if inp.right: move_x += 1
+
+        if inp.jump and self.on_ground:
+            self.p_vy = JUMP_FORCE
+            self.on_ground = False
+
+        current_speed = 0
+        if move_x != 0:
+            same_dir = (move_x > 0 and self.facing == 'right') or (move_x < 0 and self.facing == 'left')
+            current_speed = SPEED_FORWARD if same_dir else SPEED_BACKWARD
+
+        actual_move = move_x * current_speed
+
+        if actual_move > 0 and self.p_x - self.scroll_x >= 400:
+            self.scroll_x += actual_move
+            self.p_x += actual_move
+        else:
+            self.p_x += actual_move
+            self.p_x = max(self.scroll_x, min(self.p_x, self.scroll_x + SCREEN_WIDTH))
+
+        self.p_vy += GRAVITY
+        self.p_y += self.p_vy
+
+        ground_y = GROUND_Y
+        if self.p_y >= ground_y:
+            self.p_y = ground_y
+            self.p_vy = 0
+            self.on_ground = True
+        else:
+            self.on_ground = False
+
+        if prof: prof.lap(P_PHYSICS)
+
+        obstacles = self.obstacles
+        self.level.advance(self.scroll_x)
+        obstacles.expire(self.scroll_x - LEVEL_BEHIND)
+        player_rect = [self.p_x - 15, self.p_y - 40, self.p_x + 15, self.p_y]
+
+        for obs_x, obs_h, obs_w in obstacles.query(player_rect[0], player_rect[2]):
+            obs_l = obs_x
+            obs_r = obs_x + obs_w
+            obs_t = ground_y - obs_h
+            obs_b = ground_y
+
+            if (player_rect[3] > obs_t and player_rect[1] < obs_b):
+
+                overlap_left = player_rect[2] - obs_l
+                overlap_right = obs_r - player_rect[0]
+                overlap_top = player_rect[3] - obs_t
+                overlap_bottom = obs_b - player_rect[1]
+
+                min_overlap = min(overlap_left, overlap_right, overlap_top, overlap_bottom)
+
+                if min_overlap == overlap_top:
+                    if self.p_vy >= 0:
+                        self.p_y = obs_t
+                        self.p_vy = 0
+                        self.on_ground = True
+
+                elif min_overlap == overlap_bottom:
+                    self.p_y = obs_b + 40
+                    self.p_vy = 0
+
+                elif min_overlap == overlap_left:
+                    self.p_x = obs_l - 15
+
+                elif min_overlap == overlap_right:
+                    self.p_x = obs_r + 15
+
+        if prof: prof.lap(P_OBSTACLES)
+
+        self.update_monsters(current_time)
+
+        if inp.reload:
+            if not self.is_reloading and self.ammo < PLAYER_MAX_AMMO:
+                self.is_reloading = True
+                self.reload_start_time = current_time
+                events.append(EVT_RELOAD)
+
+        if self.is_reloading:
+            if current_time - self.reload_start_time >= self.balance.reload_time:
+                self.ammo = PLAYER_MAX_AMMO
+                self.is_reloading = False
+
+        if inp.fire and not self.is_reloading and self.ammo > 0:
+            if current_time - self.last_shot_time > 0.1:
+                self.fire_bullet(inp.mouse_x, inp.mouse_y)
+                self.ammo -= 1
+                self.last_shot_time = current_time
+                events.append(EVT_SHOT)
+
+        if prof: prof.lap(P_PHYSICS)
+
+        if self.update_bullets(events):
+            return events
+        if prof: prof.lap(P_BULLETS)
+
+        if self.update_bombs(events, current_time):
+            return events
+        if prof: prof.lap(P_BOMBS)
+
+        self.check_caught(events)
+        if prof: prof.lap(P_PHYSICS)
+        return events
+
+    def update_monsters(self, current_time):
+        balance = self.balance
+        if self.m_stunned:
+            if current_time > self.m_stun_end_time:
+                self.m_stunned = False
+        else:
+            if self.m_x < self.p_x:
+                self.m_x += balance.monster_speed
+            elif self.m_x > self.p_x:
+                self.m_x -= balance.monster_speed
+
+    def update_bullets(self, events):
+        # 판이 끝나면 True
+        bullets = self.bullets
+        bullets.integrate()
+        hits = self.bullet_hits(events)
+        if self.state != "PLAY":
+            return True
+        bullets.compact(~(hits | bullets.outside(self.scroll_x, 0, self.scroll_x + SCREEN_WIDTH, SCREEN_HEIGHT)))
+        return False
+
+    def bullet_hits(self, events):
+        # 괴물에 맞은 총알 마스크를 돌려주고 피해를 준다
+        if self.masks:
+            hits = self.bullets.mask_hits(self.masks.monster, self.m_x, self.m_y)
+        else:
+            hits = self.bullets.segment_hits(self.m_x, self.m_y, MONSTER_HIT_RADIUS)
+        hit_count = int(np.count_nonzero(hits))
+        if hit_count:
+            self.m_hp -= hit_count * DAMAGE_PER_BULLET
+            if self.m_hp <= 0:
+                self.game_clear(events)
+        return hits
+
+    def update_bombs(self, events, current_time):
+        # 판이 끝나면 True
+        bombs = self.bombs
+        if not bombs.n:
+            return False
+        n = bombs.n
+        exploded = bombs.exploded[:n]
+        expired = exploded & (current_time - bombs.explode_time[:n] > EXPLOSION_DURATION)
+        flying = ~exploded
+        bombs.integrate(flying)
+
+        direct = flying & self.bomb_direct_hits()
+        arrived = flying & ~direct & (bombs.dist_sq_to_target() < BOMB_SPEED * BOMB_SPEED)
+        bombs.x[:n][arrived] = bombs.tx[:n][arrived]
+        bombs.y[:n][arrived] = bombs.ty[:n][arrived]
+
+        boom = direct | arrived
+        boom_count = int(np.count_nonzero(boom))
+        if boom_count:
+            exploded |= boom
+            bombs.explode_time[:n][boom] = current_time
+            events.extend([EVT_BOMB] * boom_count)
+            self.explode(direct, arrived, current_time, events)
+            if self.state != "PLAY":
+                return True
+
+        if expired.any():
+            bombs.compact(~expired)
+        return False
+
+    def bomb_direct_hits(self):
+        if self.masks:
+            return self.bombs.mask_hits(self.masks.monster_bomb, self.m_x, self.m_y)
+        return self.bombs.segment_hits(self.m_x, self.m_y, 70)
+
+    def explode(self, direct, arrived, current_time, events):
+        # direct: 괴물에 바로 맞은 폭탄, arrived: 목표 지점에 떨어져 터진 폭탄
+        balance = self.balance
+        bombs = self.bombs
+        n = bombs.n
+        sx = bombs.x[:n] - self.m_x
+        sy = bombs.y[:n] - self.m_y
+        splash_r = balance.explosion_radius + 60
+        splash = arrived & (sx * sx + sy * sy < splash_r * splash_r)
+        dmg_count = int(np.count_nonzero(direct | splash))
+        if dmg_count:
+            self.m_stunned = True
+            self.m_stun_end_time = current_time + balance.stun_time
+            self.m_hp -= dmg_count * balance.bomb_damage
+            if self.m_hp <= 0:
+                self.game_clear(events)
+
+    def check_caught(self, events):
+        p_center_y = self.p_y - 20
+        if self.masks:
+            caught = self.masks.player(self.facing).overlaps(
+                self.masks.monster, self.m_x - self.p_x, self.m_y - p_center_y)
+        else:
+            caught = math.sqrt((self.p_x - self.m_x)**2 + (p_center_y - self.m_y)**2) < 80
+
+        if caught:
+            self.state = "GAME_OVER"
+            events.append(EVT_GAME_OVER)
+
+    def save_prev(self):
+        # 렌더링 보간용으로 틱 시작 시점의 위치를 남겨 둔다
+        self.prev_p_x = self.p_x
+        self.prev_p_y = self.p_y
+        self.prev_m_x = self.m_x
+        self.prev_m_y = self.m_y
+        self.prev_scroll_x = self.scroll_x
+
+    def fire_bullet(self, mouse_x, mouse_y):
+        dx = mouse_x + self.scroll_x - self.p_x
+        dy = mouse_y - (self.p_y - 20)
+        angle = math.atan2(dy, dx)
+        self.bullets.spawn(self.p_x, self.p_y - 20, angle)
+
+    def use_bomb(self):
+        if self.bomb_count > 0:
+            self.bomb_count -= 1
+            self.bombs.spawn(self.p_x, self.p_y - 20, self.m_x, self.m_y)
+
+    def state_digest(self):
+        # 리플레이 검증용: 같은 시드 + 같은 입력이면 같은 값이 나와야 한다
+        h = hashlib.sha1()
+        h.update(repr((
+            self.state, self.time, self.p_x, self.p_y, self.p_vy, self.m_x, self.m_y,
+            self.m_hp, self.m_stunned, self.ammo, self.bomb_count, self.is_reloading,
+            self.scroll_x, len(self.obstacles),
+        )).encode())
+        for pool in (self.bullets, self.bombs):
+            for col in pool.columns:
+                h.update(col[:pool.n].tobytes())
+        return h.hexdigest()
+
+    # 되감기용 스냅샷: [풀마다 개수][풀 열의 살아 있는 부분 원시 바이트...][나머지 값 marshal]
+    # 배열을 앞에 두어 틱 사이 바이트 위치가 잘 어긋나지 않게 한다 (rewind.py 의 XOR 델타가 잘 줄어든다)
+    def snapshot_pools(self):
+        return (self.bullets, self.bombs)
+
+    def snapshot_values(self):
+        track = self.obstacles
+        head = track.head
+        return (
+            self.time, self.state, self.clear_time,
+            self.p_x, self.p_y, self.p_vx, self.p_vy, self.on_ground, self.facing,
+            self.ammo, self.bomb_count, self.is_reloading, self.reload_start_time, self.last_shot_time,
+            self.m_x, self.m_y, self.m_hp, self.m_stunned, self.m_stun_end_time,
+            self.scroll_x, self.prev_p_x, self.prev_p_y, self.prev_m_x, self.prev_m_y, self.prev_scroll_x,
+            track.xs[head:], track.hs[head:], track.ws[head:],
+            self.level.level_seed, self.level.next_index, self.rng.getstate(),
+        )
+
+    def restore_values(self, values):
+        (self.time, self.state, self.clear_time,
+         self.p_x, self.p_y, self.p_vx, self.p_vy, self.on_ground, self.facing,
+         self.ammo, self.bomb_count, self.is_reloading, self.reload_start_time, self.last_shot_time,
+         self.m_x, self.m_y, self.m_hp, self.m_stunned, self.m_stun_end_time,
+         self.scroll_x, self.prev_p_x, self.prev_p_y, self.prev_m_x, self.prev_m_y, self.prev_scroll_x,
+         xs, hs, ws, level_seed, next_index, rng_state) = values
+        self.obstacles.restore(xs, hs, ws)
+        self.level.restore(level_seed, next_index)
+        self.rng.setstate(rng_state)
+
+    def save_state(self):
+        pools = self.snapshot_pools()
+        parts = [struct.pack(f"<{len(pools)}I", *[pool.n for pool in pools])]
+        for pool in pools:
+            n = pool.n
+            for col in pool.columns:
+                parts.append(col[:n].tobytes())
+        parts.append(marshal.dumps(self.snapshot_values()))
+        return b"".join(parts)
+
+    def load_state(self, data):
+        pools = self.snapshot_pools()
+        counts = struct.unpack_from(f"<{len(pools)}I", data)
+        pos = 4 * len(pools)
+        for pool, n in zip(pools, counts):
+            for col in pool.columns:
+                col[:n] = np.frombuffer(data, col.dtype, n, pos)
+                pos += n * col.itemsize
+            pool.n = n
+        self.restore_values(marshal.loads(memoryview(data)[pos:]))
+
+    def game_clear(self, events):
+        self.state = "CLEAR"
+        self.clear_time = self.time
+        events.append(EVT_CLEAR)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import math
+
+import numpy as np
+
+KEY_SPAN = 1 << 20     # 칸 키 = cx * KEY_SPAN + cy (cy 는 화면 높이 안쪽이라 충분하다)
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+class SpatialHash:
+    # 균일 격자 공간 해시
+    # build() 가 점들을 칸 키 순서로 정렬해 두면 query_pairs() 는 질의 원이 걸칠 수 있는 칸의 점만
+    # searchsorted 로 찾아 (질의 번호, 점 번호) 짝으로 돌려준다. 정확한 거리 판정은 호출하는 쪽에서 한다
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.order = _EMPTY
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _cells(self, xs, ys):
+        cell = self.cell_size
+        return np.floor(xs / cell).astype(np.int64), np.floor(ys / cell).astype(np.int64)
+
+    def build(self, xs, ys):
+        cx, cy = self._cells(xs, ys)
+        keys = cx * KEY_SPAN + cy
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def query_pairs(self, qx, qy, radius):
+        if not len(self.keys) or not len(qx):
+            return _EMPTY, _EMPTY
+
+        reach = math.ceil(radius / self.cell_size)
+        offsets = np.arange(-reach, reach + 1)
+        cx, cy = self._cells(qx, qy)
+        # 질의마다 (2*reach+1)^2 칸의 키를 한 번에 만든다
+        keys = (((cx[:, None] + offsets) * KEY_SPAN)[:, :, None] + (cy[:, None] + offsets)[:, None, :]).reshape(len(qx), -1)
+        lo = np.searchsorted(self.keys, keys, "left").ravel()
+        hi = np.searchsorted(self.keys, keys, "right").ravel()
+        counts = hi - lo
+        total = int(counts.sum())
+        if not total:
+            return _EMPTY, _EMPTY
+
+        query = np.repeat(np.arange(len(qx)).repeat(keys.shape[1]), counts)
+        first = np.cumsum(counts) - counts
+        pos = np.repeat(lo - first, counts) + np.arange(total)
+        return query, self.order[pos]
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# 게임 모듈은 서로 이름만으로 import 하므로 (from settings import *) 게임 폴더를 경로에 넣는다
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
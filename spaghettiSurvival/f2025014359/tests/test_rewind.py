@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# SnapshotRing 과 Simulation.save_state / load_state 검사
+#   python -m pytest tests
+import random
+
+import pytest
+
+from settings import *
+from rewind import SnapshotRing
+from simulation import Simulation, InputState
+from wave import WaveSimulation
+
+
+def scripted_input(rng):
+    # 쏘고 움직이고 가끔 폭탄을 던지는 입력 (상태가 틱마다 조금씩 바뀌게)
+    return InputState(
+        left=rng.random() < 0.2,
+        right=rng.random() < 0.5,
+        jump=rng.random() < 0.05,
+        reload=rng.random() < 0.01,
+        fire=rng.random() < 0.7,
+        bomb=rng.random() < 0.01,
+        mouse_x=rng.randrange(SCREEN_WIDTH),
+        mouse_y=rng.randrange(SCREEN_HEIGHT),
+    )
+
+
+def play(sim, ticks, seed):
+    # ticks 틱 동안의 스냅샷을 차례로 돌려준다 (판이 끝나면 거기서 멈춘다)
+    rng = random.Random(seed)
+    snapshots = [sim.save_state()]
+    for _ in range(ticks):
+        if sim.state != "PLAY":
+            break
+        sim.step(scripted_input(rng), TICK)
+        snapshots.append(sim.save_state())
+    return snapshots
+
+
+def test_rewind_returns_pushed_snapshots_across_keyframes():
+    sim = Simulation(seed=3, balance=BalanceConfig(monster_speed=2))
+    snapshots = play(sim, 250, seed=1)
+    assert len(snapshots) > 3 * REWIND_KEYFRAME_EVERY
+
+    ring = SnapshotRing(seconds=10)
+    for data in snapshots:
+        ring.push(data)
+    assert len(ring) == len(snapshots)
+
+    # 한 틱씩, 그리고 여러 틱씩 건너뛰며 되감아도 넣은 것과 같은 바이트가 나와야 한다
+    expected = len(snapshots) - 1
+    for steps in [1] * 40 + [7, 13, 30, 31, 1, 2]:
+        expected = max(0, expected - steps)
+        assert ring.rewind(steps) == snapshots[expected]
+    assert ring.rewind(10 ** 6) == snapshots[0]
+
+
+def test_keyframe_every_n_records():
+    ring = SnapshotRing(seconds=10, keyframe_every=30)
+    for i in range(100):
+        ring.push(bytes([i % 251]) * 200)
+    keys = [i for i, (_, _, key) in enumerate(ring.records) if key]
+    assert keys == [0, 30, 60, 90]
+
+
+def test_push_after_rewind_continues_from_rewound_state():
+    sim = Simulation(seed=5)
+    snapshots = play(sim, 120, seed=2)
+    ring = SnapshotRing(seconds=10)
+    for data in snapshots:
+        ring.push(data)
+    assert ring.rewind(45) == snapshots[-46]
+
+    # 되감은 자리에서 다른 미래를 쌓아도 풀리는 값은 새로 넣은 것이어야 한다
+    sim.load_state(snapshots[-46])
+    branch = play(sim, 60, seed=99)[1:]
+    for data in branch:
+        ring.push(data)
+    for i in range(len(branch) - 2, -1, -1):
+        assert ring.rewind(1) == branch[i]
+    assert ring.rewind(1) == snapshots[-46]
+
+
+def test_tiny_arena_wraps_and_keeps_newest_records():
+    sim = Simulation(seed=7)
+    snapshots = play(sim, 300, seed=3)
+    ring = SnapshotRing(seconds=10, buffer_bytes=16 * 1024, keyframe_every=8)
+
+    wrapped = False
+    last_pos = -1
+    for data in snapshots:
+        ring.push(data)
+        pos = ring.records[-1][0]
+        wrapped |= pos < last_pos
+        last_pos = pos
+        # 남아 있는 기록은 언제나 키프레임으로 시작하고 영역 안에 서로 겹치지 않고 들어 있다
+        assert ring.records[0][2]
+        spans = sorted((p, p + size) for p, size, _ in ring.records)
+        assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:]))
+        assert spans[-1][1] <= len(ring.arena)
+    assert wrapped
+    assert 0 < len(ring) < len(snapshots)
+
+    # 남은 기록은 모두 가장 최근 것들이고 그대로 풀린다
+    kept = len(ring)
+    for i in range(kept - 2, -1, -1):
+        assert ring.rewind(1) == snapshots[len(snapshots) - kept + i]
+    assert len(ring) == 1
+
+
+def test_snapshot_larger_than_arena():
+    ring = SnapshotRing(seconds=10, buffer_bytes=64)
+    rng = random.Random(0)
+    big = bytes(rng.randrange(256) for _ in range(1000))
+
+    ring.push(b"small")
+    ring.push(big)
+    assert len(ring) == 0
+    assert ring.rewind(1) is None
+
+    # 다시 들어가는 크기부터는 평소처럼 쌓인다
+    ring.push(b"a" * 10)
+    ring.push(b"b" * 10)
+    assert len(ring) == 2
+    assert ring.rewind(1) == b"a" * 10
+
+
+@pytest.mark.parametrize("sim_class", [Simulation, WaveSimulation])
+def test_load_state_then_continue_matches_digest(sim_class):
+    rng = random.Random(11)
+    inputs = [scripted_input(rng) for _ in range(600)]
+
+    sim = sim_class(seed=21)
+    for inp in inputs[:200]:
+        sim.step(inp, TICK)
+    saved = sim.save_state()
+    for inp in inputs[200:]:
+        sim.step(inp, TICK)
+    expected = sim.state_digest()
+
+    # 다른 판을 돌리던 객체에 불러와도, 같은 객체를 되돌려도 이어서 같은 결과가 나와야 한다
+    other = sim_class(seed=999)
+    for inp in inputs[:50]:
+        other.step(inp, TICK)
+    for target in (other, sim):
+        target.load_state(saved)
+        assert target.save_state() == saved
+        for inp in inputs[200:]:
+            target.step(inp, TICK)
+        assert target.state_digest() == expected
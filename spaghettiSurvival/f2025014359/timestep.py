@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from settings import *
+
+
+class FixedTimestep:
+    # 흘러간 실제 시간을 누적해서 고정 길이 틱 개수로 바꿔 준다
+    # 한 프레임에 max_steps 보다 많이 밀리면 나머지는 버리고(dropped) 따라잡지 않는다
+    def __init__(self, tick=TICK, max_steps=MAX_CATCHUP_STEPS):
+        self.tick = tick
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt):
+        self.accumulator += frame_dt
+        steps = int(self.accumulator // self.tick)
+        if steps > self.max_steps:
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.tick + steps * self.tick
+        self.accumulator -= steps * self.tick
+        return steps
+
+    @property
+    def alpha(self):
+        # 마지막 틱과 다음 틱 사이 어디쯤 그리는지 (0~1)
+        return min(1.0, self.accumulator / self.tick)
+
+
+# FramePacer 단계 (위로 갈수록 앞 단계를 모두 포함한다)
+Q_FULL = 0
+Q_SKIP_RENDER = 1       # 시뮬레이션 틱은 그대로 두고 렌더링을 한 프레임 걸러 한다
+Q_STATIC_BG = 2         # 배경 패럴랙스 스크롤을 멈춘다
+Q_SIMPLE_BULLETS = 3    # 총알을 가는 선으로 그린다
+Q_THIN_HUD = 4          # HUD 글자를 PACE_HUD_EVERY 프레임마다만 고친다
+QUALITY_NAMES = ("최고", "렌더 건너뛰기", "배경 고정", "총알 단순화", "HUD 줄임")
+
+
+class FramePacer:
+    # 프레임 작업 시간의 지수 이동 평균을 틱 길이와 비교해서 부하 단계를 정한다
+    # 올리고 내리는 기준 사이에 간격을 두고 연속 프레임 수를 따로 세서 단계가 오락가락하지 않게 한다
+    def __init__(self, budget=TICK):
+        self.budget = budget
+        self.skipped = 0
+        self.changes = 0
+        self.reset()
+
+    def reset(self):
+        self.level = Q_FULL
+        self.load = 0.0
+        self.over = 0
+        self.under = 0
+        self.frame = 0
+
+    @property
+    def level_name(self):
+        return QUALITY_NAMES[self.level]
+
+    def should_render(self):
+        self.frame += 1
+        if self.level >= Q_SKIP_RENDER and self.frame % 2:
+            self.skipped += 1
+            return False
+        return True
+
+    def record(self, cost):
+        # 프레임 하나의 작업 시간(초)을 넣는다. 단계가 바뀌면 True
+        self.load += (cost / self.budget - self.load) * 0.1
+        if self.load > PACE_HIGH_LOAD:
+            self.over += 1
+            self.under = 0
+        elif self.load < PACE_LOW_LOAD:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+
+        if self.over >= PACE_DEGRADE_FRAMES and self.level < Q_THIN_HUD:
+            self.level += 1
+        elif self.under >= PACE_RESTORE_FRAMES and self.level > Q_FULL:
+            self.level -= 1
+        else:
+            return False
+        self.over = self.under = 0
+        self.changes += 1
+        return True
@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+# 학습용 일괄 환경: N 개의 판을 (N, ...) 배열에 담아 한 번의 step() 으로 같이 진행한다
+# 틱 순서와 충돌/타이머 규칙은 Simulation.step 과 같다
+# 괴물 판정은 생성자의 masks 로 고른다: SpriteMasks 를 주면 게임과 같은 픽셀 마스크, None 이면 원/거리 판정
+# (Simulation(masks=...) 와 같은 값을 줘야 같은 결과가 나온다)
+# 장애물은 level.generate_chunk 를 그대로 쓰므로 판의 level_seed 가 같으면 Simulation 과 같은 지형이 나온다
+import numpy as np
+
+from settings import *
+from projectiles import segment_dist_sq
+from level import generate_chunk, chunk_left, first_needed_chunk
+
+# 행동 배열 (N, ACTION_SIZE) 의 열. 버튼은 0.5 보다 크면 눌린 것, 마우스는 화면 좌표
+A_LEFT = 0
+A_RIGHT = 1
+A_JUMP = 2
+A_RELOAD = 3
+A_FIRE = 4
+A_BOMB = 5
+A_MOUSE_X = 6
+A_MOUSE_Y = 7
+ACTION_SIZE = 8
+
+# 관측 배열 (N, len(OBS_FIELDS)) 의 열
+OBS_FIELDS = (
+    "player_screen_x", "player_y", "player_vy", "on_ground",
+    "monster_dx", "monster_dy", "monster_hp", "monster_stunned",
+    "ammo", "reloading", "bombs",
+    "obstacle_dx", "obstacle_h",
+)
+
+# 판 상태
+ST_PLAY = 0
+ST_GAME_OVER = 1
+ST_CLEAR = 2
+
+BULLETS_PER_ENV = 32       # 연사 간격 0.1초, 화면 밖으로 나가면 사라지므로 동시에 12발을 넘지 않는다
+OBSTACLE_START_CAPACITY = 32
+
+
+def action_row(inp):
+    # InputState -> 행동 배열의 한 줄
+    return [inp.left, inp.right, inp.jump, inp.reload, inp.fire, inp.bomb, inp.mouse_x, inp.mouse_y]
+
+
+class VecEnv:
+    # step() 이 끝난 판(클리어/게임오버/max_ticks 초과)은 그 자리에서 새 판으로 바꾸고
+    # 돌려주는 관측도 새 판의 것이다. 끝난 판의 결과는 outcome / episode_time 에 남는다
+    def __init__(self, num_envs, seed=None, balance=None, max_ticks=None, masks=None):
+        self.num_envs = num_envs
+        self.balance = balance or BalanceConfig()
+        self.max_ticks = max_ticks
+        # masks: SpriteMasks (masks.load_sprite_masks) 면 픽셀 마스크 판정, None 이면 원 판정
+        self.masks = masks
+        self.rng = np.random.default_rng(seed)
+
+        n = num_envs
+        self.time = np.zeros(n)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.status = np.zeros(n, dtype=np.int8)
+        self.p_x = np.zeros(n)
+        self.p_y = np.zeros(n)
+        self.p_vy = np.zeros(n)
+        self.on_ground = np.zeros(n, dtype=bool)
+        self.facing_left = np.zeros(n, dtype=bool)
+        self.scroll_x = np.zeros(n)
+
+        self.ammo = np.zeros(n, dtype=np.int64)
+        self.bomb_count = np.zeros(n, dtype=np.int64)
+        self.is_reloading = np.zeros(n, dtype=bool)
+        self.reload_start_time = np.zeros(n)
+        self.last_shot_time = np.zeros(n)
+
+        self.m_x = np.zeros(n)
+        self.m_y = np.zeros(n)
+        self.m_hp = np.zeros(n, dtype=np.int64)
+        self.m_stunned = np.zeros(n, dtype=bool)
+        self.m_stun_end_time = np.zeros(n)
+
+        shape = (n, BULLETS_PER_ENV)
+        self.b_alive = np.zeros(shape, dtype=bool)
+        self.b_x = np.zeros(shape)
+        self.b_y = np.zeros(shape)
+        self.b_px = np.zeros(shape)
+        self.b_py = np.zeros(shape)
+        self.b_dx = np.zeros(shape)
+        self.b_dy = np.zeros(shape)
+
+        # 판마다 폭탄은 BOMB_MAX_COUNT 개뿐이라 칸이 모자랄 일이 없다
+        shape = (n, BOMB_MAX_COUNT)
+        self.k_alive = np.zeros(shape, dtype=bool)
+        self.k_x = np.zeros(shape)
+        self.k_y = np.zeros(shape)
+        self.k_px = np.zeros(shape)
+        self.k_py = np.zeros(shape)
+        self.k_dx = np.zeros(shape)
+        self.k_dy = np.zeros(shape)
+        self.k_tx = np.zeros(shape)
+        self.k_ty = np.zeros(shape)
+        self.k_exploded = np.zeros(shape, dtype=bool)
+        self.k_explode_time = np.zeros(shape)
+
+        # 장애물은 판마다 x 순서대로 쌓이는 링 버퍼 [head, head + count)
+        # 가득 차면 모든 판의 용량을 두 배로 늘린다
+        shape = (n, OBSTACLE_START_CAPACITY)
+        self.o_x = np.zeros(shape)
+        self.o_h = np.zeros(shape)
+        self.o_head = np.zeros(n, dtype=np.int64)
+        self.o_count = np.zeros(n, dtype=np.int64)
+        self.level_seed = np.zeros(n, dtype=np.int64)
+        self.next_chunk = np.zeros(n, dtype=np.int64)
+
+        self.outcome = np.zeros(n, dtype=np.int8)
+        self.episode_time = np.zeros(n)
+        self.reset()
+
+    def reset(self, mask=None):
+        # mask 가 True 인 판만 (생략하면 전부) 처음 상태로 되돌리고 전체 관측을 돌려준다
+        m = slice(None) if mask is None else np.asarray(mask, dtype=bool)
+        b = self.balance
+        self.time[m] = 0.0
+        self.ticks[m] = 0
+        self.status[m] = ST_PLAY
+        self.p_x[m] = 400
+        self.p_y[m] = 350
+        self.p_vy[m] = 0
+        self.on_ground[m] = False
+        self.facing_left[m] = False
+        self.scroll_x[m] = 0
+
+        self.ammo[m] = PLAYER_MAX_AMMO
+        self.bomb_count[m] = BOMB_MAX_COUNT
+        self.is_reloading[m] = False
+        self.reload_start_time[m] = 0
+        self.last_shot_time[m] = 0
+
+        self.m_x[m] = 100
+        self.m_y[m] = 320
+        self.m_hp[m] = b.monster_max_hp
+        self.m_stunned[m] = False
+        self.m_stun_end_time[m] = 0
+
+        self.b_alive[m] = False
+        self.k_alive[m] = False
+        self.k_exploded[m] = False
+        self.o_head[m] = 0
+        self.o_count[m] = 0
+        self.level_seed[m] = self.rng.integers(0, 1 << 32, self.num_envs if mask is None else int(np.count_nonzero(m)))
+        self.next_chunk[m] = 0
+        self.stream_chunks()
+        return self.observe()
+
+    def _obstacle_order(self):
+        # 판마다 오래된(x 가 작은) 장애물부터 놓인 칸 번호와 유효 여부
+        cap = self.o_x.shape[1]
+        k = np.arange(cap)
+        slots = (self.o_head[:, None] + k) % cap
+        return slots, k < self.o_count[:, None]
+
+    def _grow_obstacles(self):
+        slots, _ = self._obstacle_order()
+        cap = self.o_x.shape[1]
+        for name in ("o_x", "o_h"):
+            old = np.take_along_axis(getattr(self, name), slots, axis=1)
+            new = np.zeros((self.num_envs, cap * 2))
+            new[:, :cap] = old
+            setattr(self, name, new)
+        self.o_head[:] = 0
+
+    def stream_chunks(self):
+        # LevelStream.advance 와 같은 규칙으로 카메라 앞에 들어온 청크를 판마다 넣는다
+        # 한 판이 청크 하나를 넘는 데 백 틱 가까이 걸리므로 틱마다 몇 판만 파이썬 루프를 돈다
+        edge = self.scroll_x + SCREEN_WIDTH + LEVEL_LOOKAHEAD
+        for i in np.flatnonzero(chunk_left(self.next_chunk) < edge):
+            index = max(int(self.next_chunk[i]), first_needed_chunk(self.scroll_x[i]))
+            while chunk_left(index) < edge[i]:
+                chunk = generate_chunk(int(self.level_seed[i]), index)
+                while self.o_count[i] + len(chunk) > self.o_x.shape[1]:
+                    self._grow_obstacles()
+                cap = self.o_x.shape[1]
+                for x, h, w in chunk:
+                    slot = (self.o_head[i] + self.o_count[i]) % cap
+                    self.o_x[i, slot] = x
+                    self.o_h[i, slot] = h
+                    self.o_count[i] += 1
+                index += 1
+            self.next_chunk[i] = index
+
+    def step(self, actions):
+        a = np.asarray(actions, dtype=float)
+        b = self.balance
+        pressed = a[:, :A_MOUSE_X] > 0.5
+        left = pressed[:, A_LEFT]
+        right = pressed[:, A_RIGHT]
+        mouse_x = a[:, A_MOUSE_X]
+        mouse_y = a[:, A_MOUSE_Y]
+        hp_before = self.m_hp.copy()
+
+        self.time += TICK
+        self.ticks += 1
+        t = self.time
+
+        # 폭탄 (Simulation.use_bomb)
+        throw = pressed[:, A_BOMB] & (self.bomb_count > 0)
+        if throw.any():
+            self.bomb_count -= throw
+            rows = np.flatnonzero(throw)
+            slot = np.argmin(self.k_alive[rows], axis=1)
+            x = self.p_x[rows]
+            y = self.p_y[rows] - 20
+            angle = np.arctan2(self.m_y[rows] - y, self.m_x[rows] - x)
+            self.k_alive[rows, slot] = True
+            self.k_x[rows, slot] = self.k_px[rows, slot] = x
+            self.k_y[rows, slot] = self.k_py[rows, slot] = y
+            self.k_dx[rows, slot] = np.cos(angle)
+            self.k_dy[rows, slot] = np.sin(angle)
+            self.k_tx[rows, slot] = self.m_x[rows]
+            self.k_ty[rows, slot] = self.m_y[rows]
+            self.k_exploded[rows, slot] = False
+            self.k_explode_time[rows, slot] = 0
+
+        # 이동 / 스크롤
+        self.facing_left = mouse_x + self.scroll_x < self.p_x
+        move_x = right.astype(np.int64) - left
+        jump = pressed[:, A_JUMP] & self.on_ground
+        self.p_vy[jump] = JUMP_FORCE
+        self.on_ground[jump] = False
+
+        same_dir = ((move_x > 0) & ~self.facing_left) | ((move_x < 0) & self.facing_left)
+        actual_move = move_x * np.where(same_dir, SPEED_FORWARD, SPEED_BACKWARD)
+
+        scrolling = (actual_move > 0) & (self.p_x - self.scroll_x >= 400)
+        self.scroll_x += np.where(scrolling, actual_move, 0)
+        self.p_x += actual_move
+        self.p_x = np.where(scrolling, self.p_x,
+                            np.maximum(self.scroll_x, np.minimum(self.p_x, self.scroll_x + SCREEN_WIDTH)))
+
+        self.p_vy += GRAVITY
+        self.p_y += self.p_vy
+        self.on_ground = self.p_y >= GROUND_Y
+        self.p_y[self.on_ground] = GROUND_Y
+        self.p_vy[self.on_ground] = 0
+
+        # 장애물 생성 / 제거
+        self.stream_chunks()
+
+        slots, valid = self._obstacle_order()
+        ox = np.take_along_axis(self.o_x, slots, axis=1)
+        # x 순서로 쌓여 있으니 min_x 보다 작은 것은 항상 앞쪽에 몰려 있다
+        drop = np.count_nonzero(valid & (ox < (self.scroll_x - LEVEL_BEHIND)[:, None]), axis=1)
+        if drop.any():
+            self.o_head = (self.o_head + drop) % self.o_x.shape[1]
+            self.o_count -= drop
+            slots, valid = self._obstacle_order()
+            ox = np.take_along_axis(self.o_x, slots, axis=1)
+        oh = np.take_along_axis(self.o_h, slots, axis=1)
+
+        # 충돌 (Simulation 과 같이 이동 후 위치로 만든 사각형 하나로 앞에서부터 차례로 밀어낸다)
+        r_l = (self.p_x - 15)[:, None]
+        r_r = (self.p_x + 15)[:, None]
+        r_t = (self.p_y - 40)[:, None]
+        r_b = self.p_y[:, None]
+        obs_t = GROUND_Y - oh
+        touching = valid & (ox < r_r) & (ox + OBSTACLE_WIDTH > r_l) & (r_b > obs_t) & (r_t < GROUND_Y)
+        for k in np.flatnonzero(touching.any(axis=0)):
+            hit = touching[:, k]
+            x = ox[:, k]
+            top_y = obs_t[:, k]
+            overlap_left = r_r[:, 0] - x
+            overlap_right = x + OBSTACLE_WIDTH - r_l[:, 0]
+            overlap_top = r_b[:, 0] - top_y
+            overlap_bottom = GROUND_Y - r_t[:, 0]
+            min_overlap = np.minimum(np.minimum(overlap_left, overlap_right), np.minimum(overlap_top, overlap_bottom))
+
+            top = hit & (min_overlap == overlap_top)
+            rest = hit & ~top
+            bottom = rest & (min_overlap == overlap_bottom)
+            rest &= ~bottom
+            push_left = rest & (min_overlap == overlap_left)
+            push_right = rest & ~push_left & (min_overlap == overlap_right)
+
+            land = top & (self.p_vy >= 0)
+            self.p_y = np.where(land, top_y, self.p_y)
+            self.p_vy[land] = 0
+            self.on_ground |= land
+            self.p_y[bottom] = GROUND_Y + 40
+            self.p_vy[bottom] = 0
+            self.p_x = np.where(push_left, x - 15, self.p_x)
+            self.p_x = np.where(push_right, x + OBSTACLE_WIDTH + 15, self.p_x)
+
+        # 괴물
+        wake = self.m_stunned & (t > self.m_stun_end_time)
+        chase = ~self.m_stunned
+        self.m_stunned &= ~wake
+        toward = np.where(self.m_x < self.p_x, b.monster_speed, np.where(self.m_x > self.p_x, -b.monster_speed, 0))
+        self.m_x += np.where(chase, toward, 0)
+
+        # 재장전 / 사격
+        start_reload = pressed[:, A_RELOAD] & ~self.is_reloading & (self.ammo < PLAYER_MAX_AMMO)
+        self.is_reloading |= start_reload
+        self.reload_start_time[start_reload] = t[start_reload]
+        done_reload = self.is_reloading & (t - self.reload_start_time >= b.reload_time)
+        self.ammo[done_reload] = PLAYER_MAX_AMMO
+        self.is_reloading &= ~done_reload
+
+        fire = pressed[:, A_FIRE] & ~self.is_reloading & (self.ammo > 0) & (t - self.last_shot_time > 0.1)
+        if fire.any():
+            rows = np.flatnonzero(fire)
+            self.ammo[rows] -= 1
+            self.last_shot_time[rows] = t[rows]
+            free = ~self.b_alive[rows]
+            rows = rows[free.any(axis=1)]
+            slot = np.argmax(~self.b_alive[rows], axis=1)
+            x = self.p_x[rows]
+            y = self.p_y[rows] - 20
+            angle = np.arctan2(mouse_y[rows] - y, mouse_x[rows] + self.scroll_x[rows] - x)
+            self.b_alive[rows, slot] = True
+            self.b_x[rows, slot] = self.b_px[rows, slot] = x
+            self.b_y[rows, slot] = self.b_py[rows, slot] = y
+            self.b_dx[rows, slot] = np.cos(angle)
+            self.b_dy[rows, slot] = np.sin(angle)
+
+        # 총알
+        self.b_px[:] = self.b_x
+        self.b_py[:] = self.b_y
+        self.b_x += self.b_dx * BULLET_SPEED
+        self.b_y += self.b_dy * BULLET_SPEED
+        hits = self.bullet_hits()
+        self.m_hp -= np.count_nonzero(hits, axis=1) * DAMAGE_PER_BULLET
+        cleared = self.m_hp <= 0
+        playing = ~cleared
+        bx = self.b_x
+        by = self.b_y
+        sx = self.scroll_x[:, None]
+        outside = (bx < sx) | (bx > sx + SCREEN_WIDTH) | (by < 0) | (by > SCREEN_HEIGHT)
+        self.b_alive &= ~((hits | outside) & playing[:, None])
+
+        # 폭탄 이동 / 폭발
+        if self.k_alive.any():
+            exploded = self.k_exploded
+            expired = self.k_alive & exploded & ((t[:, None] - self.k_explode_time) > EXPLOSION_DURATION)
+            flying = self.k_alive & ~exploded & playing[:, None]
+            self.k_px[:] = self.k_x
+            self.k_py[:] = self.k_y
+            self.k_x += self.k_dx * (BOMB_SPEED * flying)
+            self.k_y += self.k_dy * (BOMB_SPEED * flying)
+
+            mx = self.m_x[:, None]
+            my = self.m_y[:, None]
+            direct = self.bomb_direct_hits(flying)
+            ex = self.k_x - self.k_tx
+            ey = self.k_y - self.k_ty
+            arrived = flying & ~direct & (ex * ex + ey * ey < BOMB_SPEED * BOMB_SPEED)
+            self.k_x = np.where(arrived, self.k_tx, self.k_x)
+            self.k_y = np.where(arrived, self.k_ty, self.k_y)
+
+            boom = direct | arrived
+            self.k_exploded |= boom
+            self.k_explode_time = np.where(boom, t[:, None], self.k_explode_time)
+
+            sx = self.k_x - mx
+            sy = self.k_y - my
+            splash_r = b.explosion_radius + 60
+            splash = arrived & (sx * sx + sy * sy < splash_r * splash_r)
+            dmg_count = np.count_nonzero(direct | splash, axis=1)
+            stun = dmg_count > 0
+            self.m_stunned |= stun
+            self.m_stun_end_time = np.where(stun, t + b.stun_time, self.m_stun_end_time)
+            self.m_hp -= dmg_count * b.bomb_damage
+            bomb_clear = playing & (self.m_hp <= 0)
+            cleared |= bomb_clear
+            playing &= ~bomb_clear
+            self.k_alive &= ~(expired & playing[:, None])
+
+        caught = self.check_caught(playing)
+
+        self.status[cleared] = ST_CLEAR
+        self.status[caught] = ST_GAME_OVER
+        reward = (hp_before - np.maximum(self.m_hp, 0)) / b.monster_max_hp
+        reward = reward + cleared - caught
+
+        done = self.status != ST_PLAY
+        if self.max_ticks is not None:
+            done |= self.ticks >= self.max_ticks
+        self.outcome = self.status.copy()
+        self.episode_time = self.time.copy()
+        if done.any():
+            self.reset(done)
+        return self.observe(), reward, done
+
+    def _mask_segment_hits(self, mask, alive, px, py, x, y):
+        # 살아 있는 칸만 펼쳐서 판마다 자기 괴물 위치에 놓인 마스크로 본다
+        # 총알(폭탄)은 모두 같은 속도라 선분 길이가 같아서, 판을 섞어도 Simulation 과 같은 점을 찍는다
+        rows, cols = np.nonzero(alive)
+        hits = np.zeros(alive.shape, dtype=bool)
+        hits[rows, cols] = mask.segment_hits(px[rows, cols], py[rows, cols], x[rows, cols], y[rows, cols],
+                                             self.m_x[rows], self.m_y[rows])
+        return hits
+
+    def bullet_hits(self):
+        # Simulation.bullet_hits
+        if self.masks:
+            return self._mask_segment_hits(self.masks.monster, self.b_alive,
+                                           self.b_px, self.b_py, self.b_x, self.b_y)
+        return self.b_alive & (segment_dist_sq(self.b_px, self.b_py, self.b_x, self.b_y,
+                                               self.m_x[:, None], self.m_y[:, None]) < MONSTER_HIT_RADIUS ** 2)
+
+    def bomb_direct_hits(self, flying):
+        # Simulation.bomb_direct_hits
+        if self.masks:
+            return self._mask_segment_hits(self.masks.monster_bomb, flying,
+                                           self.k_px, self.k_py, self.k_x, self.k_y)
+        return flying & (segment_dist_sq(self.k_px, self.k_py, self.k_x, self.k_y,
+                                         self.m_x[:, None], self.m_y[:, None]) < 70 * 70)
+
+    def check_caught(self, playing):
+        # Simulation.check_caught
+        dx = self.m_x - self.p_x
+        dy = self.m_y - (self.p_y - 20)
+        if not self.masks:
+            return playing & (np.sqrt(dx * dx + dy * dy) < 80)
+        # 마스크 겹침은 판마다 따로 봐야 해서, 두 마스크가 닿을 수 있는 거리 안의 판만 고른다
+        masks = self.masks
+        reach = masks.monster.reach + max(masks.player_right.reach, masks.player_left.reach)
+        caught = np.zeros(self.num_envs, dtype=bool)
+        for i in np.flatnonzero(playing & (dx * dx + dy * dy < reach * reach)):
+            player = masks.player("left" if self.facing_left[i] else "right")
+            caught[i] = player.overlaps(masks.monster, float(dx[i]), float(dy[i]))
+        return caught
+
+    def observe(self):
+        slots, valid = self._obstacle_order()
+        ox = np.take_along_axis(self.o_x, slots, axis=1)
+        oh = np.take_along_axis(self.o_h, slots, axis=1)
+        ahead = valid & (ox + OBSTACLE_WIDTH > (self.p_x - 15)[:, None])
+        first = np.argmax(ahead, axis=1)
+        has = ahead.any(axis=1)
+        rows = np.arange(self.num_envs)
+
+        obs = np.empty((self.num_envs, len(OBS_FIELDS)), dtype=np.float32)
+        obs[:, 0] = self.p_x - self.scroll_x
+        obs[:, 1] = self.p_y
+        obs[:, 2] = self.p_vy
+        obs[:, 3] = self.on_ground
+        obs[:, 4] = self.m_x - self.p_x
+        obs[:, 5] = self.m_y - (self.p_y - 20)
+        obs[:, 6] = self.m_hp / self.balance.monster_max_hp
+        obs[:, 7] = self.m_stunned
+        obs[:, 8] = self.ammo / PLAYER_MAX_AMMO
+        obs[:, 9] = self.is_reloading
+        obs[:, 10] = self.bomb_count
+        obs[:, 11] = np.where(has, ox[rows, first] - self.p_x, SCREEN_WIDTH)
+        obs[:, 12] = np.where(has, oh[rows, first], 0)
+        return obs
+
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+# 웨이브 모드: 작은 스파게티 괴물 수십~수백 마리가 양쪽에서 몰려온다
+# 총알/폭탄/플레이어와 괴물의 판정은 SpatialHash 로 근처 괴물만 골라 거리 제곱으로 비교한다
+# (SpriteMasks 가 있으면 고른 후보를 거리 대신 마스크로 판정한다)
+import hashlib
+
+import numpy as np
+
+from settings import *
+from simulation import Simulation, EVT_GAME_OVER
+from projectiles import segment_dist_sq
+from spatial import SpatialHash
+
+
+class MonsterPool:
+    # 살아 있는 괴물은 항상 [0, n) 에 모여 있다 (ProjectilePool 과 같은 방식)
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.n = 0
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.px = np.zeros(capacity)    # 직전 틱 위치 (렌더링 보간용)
+        self.py = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.hp = np.zeros(capacity, dtype=np.int64)
+        self.stunned = np.zeros(capacity, dtype=bool)
+        self.stun_end = np.zeros(capacity)
+        self.columns = [self.x, self.y, self.px, self.py, self.speed, self.hp, self.stunned, self.stun_end]
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.n = 0
+
+    def spawn(self, x, y, speed, hp):
+        if self.n == self.capacity:
+            return -1
+        i = self.n
+        self.x[i] = self.px[i] = x
+        self.y[i] = self.py[i] = y
+        self.speed[i] = speed
+        self.hp[i] = hp
+        self.stunned[i] = False
+        self.stun_end[i] = 0
+        self.n = i + 1
+        return i
+
+    def compact(self, keep):
+        idx = np.flatnonzero(keep)
+        k = len(idx)
+        if k == self.n:
+            return
+        for col in self.columns:
+            col[:k] = col[idx]
+        self.n = k
+
+
+class WaveSimulation(Simulation):
+    # 플레이어/장애물/총알/폭탄 비행은 Simulation 그대로 쓰고 괴물과 관련된 판정만 바꾼다
+    # 기존 한 마리짜리 괴물(m_x, m_y, ...)은 쓰지 않는다
+    mode = "wave"
+
+    def __init__(self, seed=None, balance=None, prefetch=False, masks=None):
+        self.monsters = MonsterPool(WAVE_MONSTER_CAPACITY)
+        self.grid = SpatialHash(SPATIAL_CELL_SIZE)
+        super().__init__(seed, balance, prefetch, masks)
+
+    def reset(self, seed=None):
+        super().reset(seed)
+        self.monsters.clear()
+        self.grid.build(self.monsters.x[:0], self.monsters.y[:0])
+        self.wave = 0
+        self.wave_size = 0
+        self.next_wave_time = 0.0
+        self.kills = 0
+
+    def spawn_wave(self):
+        self.wave += 1
+        self.next_wave_time = None
+        self.bomb_count = BOMB_MAX_COUNT
+        rng = self.rng
+        count = int(WAVE_FIRST_SIZE * WAVE_GROWTH ** (self.wave - 1))
+        self.wave_size = count
+        for _ in range(count):
+            # 화면 양쪽 바깥에 흩어 놓는다
+            offset = rng.uniform(WAVE_MONSTER_SIZE, WAVE_MONSTER_SIZE + 500)
+            if rng.random() < 0.5:
+                x = self.scroll_x - offset
+            else:
+                x = self.scroll_x + SCREEN_WIDTH + offset
+            y = rng.uniform(300, GROUND_Y - WAVE_MONSTER_RADIUS)
+            self.monsters.spawn(x, y, rng.uniform(WAVE_SPEED_MIN, WAVE_SPEED_MAX), WAVE_MONSTER_HP)
+
+    def update_monsters(self, current_time):
+        if self.next_wave_time is not None and current_time >= self.next_wave_time:
+            self.spawn_wave()
+
+        m = self.monsters
+        n = m.n
+        if n:
+            stunned = m.stunned[:n]
+            chasing = ~stunned
+            stunned &= ~(current_time > m.stun_end[:n])
+            x = m.x[:n]
+            toward = np.sign(self.p_x - x) * m.speed[:n]
+            x += np.where(chasing, toward, 0)
+        self.grid.build(m.x[:n], m.y[:n])
+
+    def remove_dead(self, events):
+        m = self.monsters
+        alive = m.hp[:m.n] > 0
+        dead = m.n - int(np.count_nonzero(alive))
+        if not dead:
+            return
+        self.kills += dead
+        m.compact(alive)
+        self.grid.build(m.x[:m.n], m.y[:m.n])
+        if not m.n:
+            if self.wave >= WAVE_COUNT:
+                self.game_clear(events)
+            else:
+                self.next_wave_time = self.time + WAVE_BREAK
+
+    def bullet_hits(self, events):
+        bullets = self.bullets
+        n = bullets.n
+        hits = np.zeros(n, dtype=bool)
+        if not n or not self.monsters.n:
+            return hits
+
+        # 총알이 이번 틱에 지나간 선분의 가운데를 기준으로 후보 괴물을 찾는다
+        px = bullets.px[:n]
+        py = bullets.py[:n]
+        x = bullets.x[:n]
+        y = bullets.y[:n]
+        mask = self.masks.wave_monster if self.masks else None
+        radius = mask.reach if mask else WAVE_MONSTER_RADIUS
+        qi, mi = self.grid.query_pairs((px + x) * 0.5, (py + y) * 0.5, radius + BULLET_SPEED * 0.5)
+        if not len(qi):
+            return hits
+        m = self.monsters
+        if mask:
+            close = mask.segment_hits(px[qi], py[qi], x[qi], y[qi], m.x[mi], m.y[mi])
+        else:
+            close = segment_dist_sq(px[qi], py[qi], x[qi], y[qi], m.x[mi], m.y[mi]) < WAVE_MONSTER_RADIUS ** 2
+        qi = qi[close]
+        mi = mi[close]
+        if not len(qi):
+            return hits
+
+        # 총알 하나는 괴물 하나에만 맞는다
+        qi, first = np.unique(qi, return_index=True)
+        hits[qi] = True
+        np.subtract.at(m.hp, mi[first], DAMAGE_PER_BULLET)
+        self.remove_dead(events)
+        return hits
+
+    def bomb_direct_hits(self):
+        bombs = self.bombs
+        n = bombs.n
+        direct = np.zeros(n, dtype=bool)
+        if not self.monsters.n:
+            return direct
+        px = bombs.px[:n]
+        py = bombs.py[:n]
+        x = bombs.x[:n]
+        y = bombs.y[:n]
+        mask = self.masks.wave_monster_bomb if self.masks else None
+        radius = mask.reach if mask else 70
+        qi, mi = self.grid.query_pairs((px + x) * 0.5, (py + y) * 0.5, radius + BOMB_SPEED * 0.5)
+        if len(qi):
+            m = self.monsters
+            if mask:
+                close = mask.segment_hits(px[qi], py[qi], x[qi], y[qi], m.x[mi], m.y[mi])
+            else:
+                close = segment_dist_sq(px[qi], py[qi], x[qi], y[qi], m.x[mi], m.y[mi]) < 70 * 70
+            direct[qi[close]] = True
+        return direct
+
+    def explode(self, direct, arrived, current_time, events):
+        # 터진 자리에서 반경 안의 괴물 모두에게 피해를 주고 기절시킨다
+        m = self.monsters
+        if not m.n:
+            return
+        balance = self.balance
+        bombs = self.bombs
+        boom = np.flatnonzero(direct | arrived)
+        bx = bombs.x[boom]
+        by = bombs.y[boom]
+        splash_r = balance.explosion_radius + WAVE_MONSTER_RADIUS
+        qi, mi = self.grid.query_pairs(bx, by, splash_r)
+        if not len(qi):
+            return
+        dx = m.x[mi] - bx[qi]
+        dy = m.y[mi] - by[qi]
+        mi = mi[dx * dx + dy * dy < splash_r * splash_r]
+        if not len(mi):
+            return
+        np.subtract.at(m.hp, mi, balance.bomb_damage)
+        m.stunned[mi] = True
+        m.stun_end[mi] = current_time + balance.stun_time
+        self.remove_dead(events)
+
+    def check_caught(self, events):
+        m = self.monsters
+        if not m.n:
+            return
+        cy = self.p_y - 20
+        masks = self.masks
+        if masks:
+            player = masks.player(self.facing)
+            radius = player.reach + masks.wave_monster.reach
+        else:
+            radius = WAVE_CATCH_DIST
+        qi, mi = self.grid.query_pairs(np.array([float(self.p_x)]), np.array([float(cy)]), radius)
+        if not len(mi):
+            return
+        dx = m.x[mi] - self.p_x
+        dy = m.y[mi] - cy
+        if masks:
+            caught = any(player.overlaps(masks.wave_monster, ox, oy) for ox, oy in zip(dx.tolist(), dy.tolist()))
+        else:
+            caught = np.any(dx * dx + dy * dy < WAVE_CATCH_DIST * WAVE_CATCH_DIST)
+        if caught:
+            self.state = "GAME_OVER"
+            events.append(EVT_GAME_OVER)
+
+    def use_bomb(self):
+        # 가장 가까운 괴물에게 던진다
+        m = self.monsters
+        if self.bomb_count > 0 and m.n:
+            dx = m.x[:m.n] - self.p_x
+            dy = m.y[:m.n] - (self.p_y - 20)
+            i = int(np.argmin(dx * dx + dy * dy))
+            self.bomb_count -= 1
+            self.bombs.spawn(self.p_x, self.p_y - 20, m.x[i], m.y[i])
+
+    def save_prev(self):
+        super().save_prev()
+        m = self.monsters
+        m.px[:m.n] = m.x[:m.n]
+        m.py[:m.n] = m.y[:m.n]
+
+    def snapshot_pools(self):
+        return super().snapshot_pools() + (self.monsters,)
+
+    def snapshot_values(self):
+        return super().snapshot_values() + (self.wave, self.wave_size, self.next_wave_time, self.kills)
+
+    def restore_values(self, values):
+        super().restore_values(values[:-4])
+        self.wave, self.wave_size, self.next_wave_time, self.kills = values[-4:]
+        m = self.monsters
+        self.grid.build(m.x[:m.n], m.y[:m.n])
+
+    def state_digest(self):
+        h = hashlib.sha1(super().state_digest().encode())
+        h.update(repr((self.wave, self.next_wave_time, self.kills)).encode())
+        m = self.monsters
+        for col in m.columns:
+            h.update(col[:m.n].tobytes())
+        return h.hexdigest()